@@ -10,28 +10,60 @@ Features:
 - บันทึกข้อมูลเป็น DataFrame
 """
 
+import logging
 import os
+import shutil
+import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 import requests
 from dotenv import load_dotenv
+from tqdm import tqdm
 
 # NLP Libraries
 from textblob import TextBlob
 
-# Temporarily disable transformers import to speed up startup
-# try:
-#     from transformers import pipeline
-#
-#     TRANSFORMERS_AVAILABLE = True
-# except ImportError:
-#     TRANSFORMERS_AVAILABLE = False
-#     print("⚠️ Warning: transformers not available. Using TextBlob only.")
+logger = logging.getLogger(__name__)
 
-TRANSFORMERS_AVAILABLE = False
+# ที่เก็บ FinBERT ที่ export เป็น ONNX + quantize เป็น int8 แล้ว
+# (อิงจาก root ของโปรเจกต์ ไม่ใช่ directory ที่รันสคริปต์)
+FINBERT_INT8_DIR = Path(__file__).resolve().parents[2] / "models" / "finbert-int8"
+
+# จำนวนข้อความต่อ batch เมื่อส่งเข้า FinBERT
+FINBERT_BATCH_SIZE = 32
+
+# ข้อความที่สั้นกว่านี้ไม่มีเนื้อหาพอให้วิเคราะห์ (เช่น "None. None")
+MIN_TEXT_LENGTH = 20
+
+# ลำดับ category ให้ตรงกับ code จาก categorize_polarity (0, 1, 2)
+SENTIMENT_LABELS = ["positive", "neutral", "negative"]
+
+
+def categorize_polarity(polarities: np.ndarray) -> pd.Categorical:
+    """
+    แปลง polarity เป็น sentiment category ทั้ง array ในครั้งเดียว
+
+    Args:
+        polarities: array ของ polarity (-1 to 1)
+
+    Returns:
+        Categorical ของ 'positive' / 'neutral' / 'negative'
+    """
+    pol = np.asarray(polarities, dtype=np.float64)
+    codes = np.where(pol > 0.1, 0, np.where(pol < -0.1, 2, 1))
+    return pd.Categorical.from_codes(codes, categories=SENTIMENT_LABELS)
+
+
+def is_trivial_text(text: Optional[str]) -> bool:
+    """ตรวจว่าข้อความว่างหรือสั้นเกินกว่าจะวิเคราะห์ sentiment ได้"""
+    if not text:
+        return True
+    stripped = text.strip()
+    return len(stripped) < MIN_TEXT_LENGTH or stripped.lower() == "none. none"
 
 
 class NewsCollector:
@@ -71,43 +103,160 @@ class NewsCollector:
         ]
 
         # Initialize sentiment analyzer
+        # FinBERT (torch + transformers) จะโหลดเมื่อขอ method="finbert" เท่านั้น
+        # เพื่อไม่ให้การสร้าง NewsCollector ต้อง import torch
         self.sentiment_analyzer = None
-        # Temporarily disable FinBERT due to PyTorch version incompatibility
-        # Use TextBlob instead (fast and reliable for now)
+        self._finbert_loaded = False
         print("📊 Using TextBlob for sentiment analysis")
-        if False and TRANSFORMERS_AVAILABLE:
-            try:
-                print("🤖 Loading FinBERT sentiment model...")
 
-                # Auto-detect GPU
-                import torch
+    def _ensure_finbert(self) -> bool:
+        """
+        โหลด FinBERT ครั้งแรกที่ต้องใช้
+
+        Returns:
+            True ถ้า FinBERT พร้อมใช้งาน
+        """
+        if self._finbert_loaded:
+            return self.sentiment_analyzer is not None
+
+        self._finbert_loaded = True
+        try:
+            print("🤖 Loading FinBERT sentiment model...")
+
+            # Auto-detect GPU
+            import torch
+
+            if torch.cuda.is_available():
+                device = 0  # Use GPU
+                print(f"   🚀 GPU detected: {torch.cuda.get_device_name(0)}")
+            else:
+                device = -1  # Use CPU
+                print(f"   💻 Using CPU (GPU not available)")
+
+            self.sentiment_analyzer = self._load_finbert_pipeline(device)
+
+            device_name = "GPU" if device == 0 else "CPU"
+            print(f"✅ FinBERT model loaded successfully on {device_name}")
+        except Exception as e:
+            print(f"⚠️ Could not load FinBERT: {e}")
+            print("📌 Using TextBlob as fallback")
+
+        return self.sentiment_analyzer is not None
 
-                if torch.cuda.is_available():
-                    device = 0  # Use GPU
-                    print(f"   🚀 GPU detected: {torch.cuda.get_device_name(0)}")
-                else:
-                    device = -1  # Use CPU
-                    print(f"   💻 Using CPU (GPU not available)")
+    @staticmethod
+    def _export_finbert_int8(quantized_dir: Path) -> None:
+        """
+        export FinBERT เป็น ONNX + quantize int8 ลง quantized_dir
+
+        เขียนลง directory ชั่วคราวก่อนแล้วค่อย rename เข้าที่ ถ้า export
+        ล้มกลางทาง quantized_dir จะไม่มีไฟล์ที่ไม่ครบค้างอยู่
+
+        Args:
+            quantized_dir: directory ปลายทาง
+        """
+        from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+
+        quantized_dir.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(
+            tempfile.mkdtemp(prefix=f"{quantized_dir.name}-", dir=quantized_dir.parent)
+        )
+        try:
+            model = ORTModelForSequenceClassification.from_pretrained(
+                "ProsusAI/finbert", export=True
+            )
+            quantizer = ORTQuantizer.from_pretrained(model)
+            quantizer.quantize(
+                save_dir=tmp_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(
+                    is_static=False, per_channel=False
+                ),
+            )
+            model.config.save_pretrained(tmp_dir)
+            AutoTokenizer.from_pretrained("ProsusAI/finbert").save_pretrained(tmp_dir)
+
+            # ลบของที่ค้างจากรอบก่อน (ไม่มี .onnx) แล้วย้ายของใหม่เข้าที่
+            shutil.rmtree(quantized_dir, ignore_errors=True)
+            tmp_dir.rename(quantized_dir)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _load_finbert_pipeline(self, device: int):
+        """
+        โหลด FinBERT pipeline
 
-                # ใช้ FinBERT สำหรับวิเคราะห์ความรู้สึกทางการเงิน
-                # Use safetensors to avoid torch.load vulnerability
-                os.environ["TRANSFORMERS_OFFLINE"] = "0"
+        บน CPU ใช้ ONNX Runtime + int8 dynamic quantization (ถ้ามี optimum)
+        ซึ่งเร็วกว่า PyTorch FP32 หลายเท่า; ถ้าไม่มี optimum จะใช้
+        transformers pipeline ที่ quantize เป็น int8 ด้วย PyTorch แทน
+        บน GPU ใช้ transformers pipeline แบบ bf16
+
+        Args:
+            device: 0 = GPU, -1 = CPU
+
+        Returns:
+            sentiment-analysis pipeline
+        """
+        if device == -1:
+            try:
+                from optimum.pipelines import pipeline as ort_pipeline
 
-                self.sentiment_analyzer = pipeline(
+                quantized_dir = FINBERT_INT8_DIR
+
+                # export + quantize ครั้งแรกครั้งเดียว แล้วใช้ไฟล์ที่ cache ไว้
+                # (ดูจากไฟล์ .onnx เพราะ directory อาจค้างจากรอบที่ export ไม่จบ)
+                if not any(quantized_dir.glob("*.onnx")):
+                    print("   ⚙️ Exporting FinBERT to ONNX (int8)...")
+                    self._export_finbert_int8(quantized_dir)
+
+                print("   ⚡ Using ONNX Runtime int8 FinBERT")
+                return ort_pipeline(
                     "sentiment-analysis",
-                    model="ProsusAI/finbert",
-                    device=device,
+                    model=str(quantized_dir),
+                    accelerator="ort",
                     max_length=512,
                     truncation=True,
-                    batch_size=8 if device == 0 else 4,  # Larger batch for GPU
-                    use_safetensors=True,  # Force use safetensors format
+                    batch_size=4,
                 )
+            except ImportError:
+                print("   📌 optimum not installed - using PyTorch FinBERT")
+
+        import torch
+        from transformers import pipeline
+
+        # ใช้ FinBERT สำหรับวิเคราะห์ความรู้สึกทางการเงิน
+        # Use safetensors to avoid torch.load vulnerability
+        os.environ["TRANSFORMERS_OFFLINE"] = "0"
+
+        # GPU: โหลด weight เป็น bf16 (fp16 ถ้าการ์ดไม่รองรับ bf16)
+        # ลด memory ครึ่งหนึ่งและใช้ tensor core ได้ (tokenizer ไม่เกี่ยว)
+        torch_dtype = None
+        if device == 0:
+            torch_dtype = (
+                torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+            )
+
+        analyzer = pipeline(
+            "sentiment-analysis",
+            model="ProsusAI/finbert",
+            device=device,
+            torch_dtype=torch_dtype,
+            max_length=512,
+            truncation=True,
+            batch_size=8 if device == 0 else 4,  # Larger batch for GPU
+            use_safetensors=True,  # Force use safetensors format
+        )
+
+        # CPU ที่ไม่มี optimum: quantize Linear layer เป็น int8 แบบ dynamic
+        if device == -1:
+            analyzer.model = torch.quantization.quantize_dynamic(
+                analyzer.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+            print("   ⚡ Using PyTorch int8 (dynamic) FinBERT")
+        else:
+            print(f"   ⚡ Using {str(torch_dtype).replace('torch.', '')} FinBERT")
 
-                device_name = "GPU" if device == 0 else "CPU"
-                print(f"✅ FinBERT model loaded successfully on {device_name}")
-            except Exception as e:
-                print(f"⚠️ Could not load FinBERT: {e}")
-                print("📌 Using TextBlob as fallback")
+        return analyzer
 
     def fetch_news(
         self,
@@ -217,6 +366,42 @@ class NewsCollector:
                 "method": "textblob",
             }
 
+    def analyze_sentiment_textblob_batch(self, texts: List[str]) -> pd.DataFrame:
+        """
+        วิเคราะห์ sentiment ด้วย TextBlob ทีละหลายข้อความ
+
+        Args:
+            texts: รายการข้อความที่ต้องการวิเคราะห์
+
+        Returns:
+            DataFrame (หนึ่งแถวต่อข้อความ) with sentiment scores
+        """
+        polarities = np.zeros(len(texts), dtype=np.float64)
+        subjectivities = np.zeros(len(texts), dtype=np.float64)
+        methods = np.full(len(texts), "textblob", dtype=object)
+
+        for i, text in enumerate(tqdm(texts, desc="sentiment", leave=False)):
+            # ข้อความว่าง/สั้นมาก ให้เป็น neutral โดยไม่ต้องวิเคราะห์
+            if is_trivial_text(text):
+                methods[i] = "shortcircuit"
+                continue
+
+            try:
+                sentiment = TextBlob(text).sentiment
+                polarities[i] = sentiment.polarity
+                subjectivities[i] = sentiment.subjectivity
+            except Exception as e:
+                logger.warning("TextBlob error: %s", e)
+
+        return pd.DataFrame(
+            {
+                "sentiment": categorize_polarity(polarities),
+                "polarity": polarities,
+                "subjectivity": subjectivities,
+                "method": methods,
+            }
+        )
+
     def analyze_sentiment_finbert(self, text: str) -> Dict:
         """
         วิเคราะห์ sentiment ด้วย FinBERT
@@ -227,7 +412,7 @@ class NewsCollector:
         Returns:
             Dict with sentiment scores
         """
-        if not self.sentiment_analyzer:
+        if not self._ensure_finbert():
             return self.analyze_sentiment_textblob(text)
 
         try:
@@ -236,26 +421,71 @@ class NewsCollector:
 
             result = self.sentiment_analyzer(text)[0]
 
-            sentiment = result["label"].lower()
-            score = result["score"]
+            return self._finbert_result_to_dict(result)
+        except Exception as e:
+            print(f"⚠️ FinBERT error: {e}")
+            return self.analyze_sentiment_textblob(text)
 
-            # Convert to polarity scale (-1 to 1)
-            if sentiment == "positive":
-                polarity = score
-            elif sentiment == "negative":
-                polarity = -score
-            else:  # neutral
-                polarity = 0.0
+    def analyze_sentiment_finbert_batch(self, texts: List[str]) -> List[Dict]:
+        """
+        วิเคราะห์ sentiment ด้วย FinBERT ทีละหลายข้อความ
 
-            return {
-                "sentiment": sentiment,
-                "polarity": polarity,
-                "confidence": score,
-                "method": "finbert",
-            }
+        เรียงข้อความตามความยาวก่อนแบ่ง batch เพื่อให้แต่ละ batch pad
+        ไปที่ความยาวใกล้เคียงกัน แล้วคืนผลลัพธ์ตามลำดับเดิม
+
+        Args:
+            texts: รายการข้อความที่ต้องการวิเคราะห์
+
+        Returns:
+            List of dicts with sentiment scores (ลำดับเดียวกับ texts)
+        """
+        if not self._ensure_finbert():
+            return self.analyze_sentiment_textblob_batch(texts).to_dict("records")
+
+        results = [None] * len(texts)
+        pending = []
+        for i, text in enumerate(texts):
+            if is_trivial_text(text):
+                results[i] = self.analyze_sentiment(text)
+            else:
+                pending.append(i)
+
+        # เรียงตามความยาว (ตัดที่ 512 ตัวอักษรเหมือน analyze_sentiment_finbert)
+        order = sorted(pending, key=lambda i: len(texts[i][:512]))
+
+        try:
+            outputs = self.sentiment_analyzer(
+                [texts[i][:512] for i in order], batch_size=FINBERT_BATCH_SIZE
+            )
+            for i, output in zip(order, outputs):
+                results[i] = self._finbert_result_to_dict(output)
         except Exception as e:
             print(f"⚠️ FinBERT error: {e}")
-            return self.analyze_sentiment_textblob(text)
+            for i in order:
+                results[i] = self.analyze_sentiment_textblob(texts[i])
+
+        return results
+
+    @staticmethod
+    def _finbert_result_to_dict(result: Dict) -> Dict:
+        """แปลงผลลัพธ์จาก FinBERT pipeline เป็น dict รูปแบบเดียวกับ TextBlob"""
+        sentiment = result["label"].lower()
+        score = result["score"]
+
+        # Convert to polarity scale (-1 to 1)
+        if sentiment == "positive":
+            polarity = score
+        elif sentiment == "negative":
+            polarity = -score
+        else:  # neutral
+            polarity = 0.0
+
+        return {
+            "sentiment": sentiment,
+            "polarity": polarity,
+            "confidence": score,
+            "method": "finbert",
+        }
 
     def analyze_sentiment(self, text: str, method: str = "auto") -> Dict:
         """
@@ -268,11 +498,43 @@ class NewsCollector:
         Returns:
             Dict with sentiment scores
         """
+        # ข้อความว่าง/สั้นมาก ไม่ต้องเสียเวลารันโมเดล
+        if is_trivial_text(text):
+            return {
+                "sentiment": "neutral",
+                "polarity": 0.0,
+                "confidence": 0.0,
+                "subjectivity": 0.0,
+                "method": "shortcircuit",
+            }
+
         if method == "finbert" or (method == "auto" and self.sentiment_analyzer):
             return self.analyze_sentiment_finbert(text)
         else:
             return self.analyze_sentiment_textblob(text)
 
+    def analyze_sentiment_batch(
+        self, texts: List[str], method: str = "auto"
+    ) -> List[Dict]:
+        """
+        วิเคราะห์ sentiment หลายข้อความในครั้งเดียว (เลือก method แบบเดียวกับ
+        analyze_sentiment)
+
+        FinBERT จะรันทุกข้อความเป็น batch ผ่าน pipeline (บน GPU ถ้ามี)
+        แทนการเรียกโมเดลทีละประโยค
+
+        Args:
+            texts: รายการข้อความที่ต้องการวิเคราะห์
+            method: 'auto', 'finbert', 'textblob'
+
+        Returns:
+            List of dicts with sentiment scores (ลำดับเดียวกับ texts)
+        """
+        if method == "finbert" or (method == "auto" and self.sentiment_analyzer):
+            return self.analyze_sentiment_finbert_batch(texts)
+        else:
+            return self.analyze_sentiment_textblob_batch(texts).to_dict("records")
+
     def process_articles(
         self, articles: List[Dict], sentiment_method: str = "auto"
     ) -> pd.DataFrame:
@@ -287,10 +549,11 @@ class NewsCollector:
             DataFrame with processed news
         """
         processed_data = []
+        texts = []
 
         print(f"\n🔍 Processing {len(articles)} articles...")
 
-        for i, article in enumerate(articles):
+        for i, article in enumerate(tqdm(articles, desc="articles", leave=False)):
             try:
                 # Extract data
                 title = article.get("title", "")
@@ -300,12 +563,6 @@ class NewsCollector:
                 source = article.get("source", {}).get("name", "Unknown")
                 url = article.get("url", "")
 
-                # Combine text for sentiment analysis
-                full_text = f"{title}. {description}"
-
-                # Analyze sentiment
-                sentiment_result = self.analyze_sentiment(full_text, sentiment_method)
-
                 # Parse datetime
                 try:
                     pub_datetime = pd.to_datetime(published_at)
@@ -319,22 +576,36 @@ class NewsCollector:
                         "description": description,
                         "source": source,
                         "url": url,
-                        "sentiment": sentiment_result["sentiment"],
-                        "polarity": sentiment_result["polarity"],
-                        "confidence": sentiment_result.get("confidence", 0.0),
-                        "subjectivity": sentiment_result.get("subjectivity", 0.0),
-                        "method": sentiment_result["method"],
                     }
                 )
 
-                if (i + 1) % 10 == 0:
-                    print(f"  Processed {i + 1}/{len(articles)} articles...")
+                # Combine text for sentiment analysis
+                texts.append(f"{title}. {description}")
 
             except Exception as e:
-                print(f"⚠️ Error processing article {i}: {e}")
+                logger.warning("Error processing article %d: %s", i, e)
                 continue
 
-        df = pd.DataFrame(processed_data)
+        if not processed_data:
+            return pd.DataFrame()
+
+        # Analyze sentiment
+        use_finbert = sentiment_method == "finbert" or (
+            sentiment_method == "auto" and self.sentiment_analyzer
+        )
+        if use_finbert:
+            df_sentiment = pd.DataFrame(self.analyze_sentiment_finbert_batch(texts))
+        else:
+            df_sentiment = self.analyze_sentiment_textblob_batch(texts)
+
+        for column in ["confidence", "subjectivity"]:
+            if column not in df_sentiment.columns:
+                df_sentiment[column] = 0.0
+        df_sentiment = df_sentiment[
+            ["sentiment", "polarity", "confidence", "subjectivity", "method"]
+        ].fillna({"confidence": 0.0, "subjectivity": 0.0})
+
+        df = pd.concat([pd.DataFrame(processed_data), df_sentiment], axis=1)
 
         if len(df) > 0:
             print(f"\n✅ Successfully processed {len(df)} articles")
@@ -0,0 +1,184 @@
+"""
+Moving Average Kernels
+======================
+SMA / EMA / WMA for many periods in one Numba call.
+
+Usage:
+    from src.features._ma_njit import MA_SMA, MA_EMA, moving_averages
+
+    sma_20, ema_20 = moving_averages(close, [MA_SMA, MA_EMA], [20, 20])
+
+Results follow TA-Lib's conventions so they can replace ``talib.SMA``,
+``talib.EMA`` and ``talib.WMA``:
+- leading NaNs are skipped and the computation starts at the first value
+- the first ``period - 1`` values after that are NaN
+- EMA is seeded with the SMA of its first ``period`` values
+- a NaN after the start makes every later SMA/EMA value NaN, like TA-Lib;
+  WMA is only NaN for the windows that contain it
+
+Without Numba, SMA/EMA come from TA-Lib and WMA from a NumPy sliding
+window, so both paths give the same NaN pattern.
+"""
+
+from typing import List, Sequence
+
+import numpy as np
+import talib
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ._njit import NUMBA_AVAILABLE, njit
+
+MA_SMA = 0
+MA_EMA = 1
+MA_WMA = 2
+
+
+def _wma_numpy(x: np.ndarray, period: int) -> np.ndarray:
+    """WMA as a dot product over sliding windows (NaN only where a window has one)"""
+    out = np.full(x.shape[0], np.nan)
+    if x.shape[0] >= period:
+        weights = np.arange(1, period + 1, dtype=np.float64)
+        out[period - 1 :] = sliding_window_view(x, period) @ (weights / weights.sum())
+    return out
+
+
+# Fallbacks when Numba is not installed
+_FALLBACK_FUNCS = {
+    MA_SMA: lambda x, period: talib.SMA(x, timeperiod=period),
+    MA_EMA: lambda x, period: talib.EMA(x, timeperiod=period),
+    MA_WMA: _wma_numpy,
+}
+
+
+@njit(cache=True)
+def _first_valid(x: np.ndarray) -> int:
+    """Index of the first non-NaN value (len(x) if there is none)"""
+    for i in range(x.shape[0]):
+        if not np.isnan(x[i]):
+            return i
+    return x.shape[0]
+
+
+@njit(cache=True)
+def _sma(x: np.ndarray, period: int, begin: int, out: np.ndarray) -> None:
+    """Running-sum SMA from `begin`"""
+    n = x.shape[0]
+    total = 0.0
+    for i in range(begin, n):
+        total += x[i]
+        if i - begin >= period:
+            total -= x[i - period]
+        if i - begin >= period - 1:
+            out[i] = total / period
+
+
+@njit(cache=True)
+def _ema(x: np.ndarray, period: int, begin: int, out: np.ndarray) -> None:
+    """EMA with k = 2 / (period + 1), seeded by the SMA of the first period"""
+    n = x.shape[0]
+    start = begin + period - 1
+    if start >= n:
+        return
+
+    prev = 0.0
+    for i in range(begin, start + 1):
+        prev += x[i]
+    prev /= period
+    out[start] = prev
+
+    k = 2.0 / (period + 1)
+    for i in range(start + 1, n):
+        prev = (x[i] - prev) * k + prev
+        out[i] = prev
+
+
+@njit(cache=True)
+def _wma(x: np.ndarray, period: int, begin: int, out: np.ndarray) -> None:
+    """
+    Linearly weighted MA (newest weight = period) via running sums
+
+    Windows containing a NaN are NaN. The running sums are rebuilt from the
+    window once the last NaN has left it, so a NaN doesn't poison every
+    later value.
+    """
+    n = x.shape[0]
+    divisor = period * (period + 1) / 2.0
+    total = 0.0
+    weighted = 0.0
+    nan_count = 0
+    stale = False
+    for i in range(begin, n):
+        if np.isnan(x[i]):
+            nan_count += 1
+        if i - begin >= period and np.isnan(x[i - period]):
+            nan_count -= 1
+
+        if nan_count > 0:
+            stale = True
+            continue
+
+        if stale:
+            total = 0.0
+            weighted = 0.0
+            for j in range(max(begin, i - period + 1), i + 1):
+                total += x[j]
+                weighted += (period - (i - j)) * x[j]
+            stale = False
+        else:
+            # Shift every weight down by one, then add the new value at `period`
+            weighted += period * x[i] - total
+            total += x[i]
+            if i - begin >= period:
+                total -= x[i - period]
+
+        if i - begin >= period - 1:
+            out[i] = weighted / divisor
+
+
+# Not parallel=True: the kernel is launched from TechnicalIndicators' thread
+# pool, and Numba's default workqueue layer can't be entered from several
+# threads (the interpreter hangs at exit). Concurrency comes from the pool.
+@njit(cache=True)
+def moving_averages_kernel(
+    x: np.ndarray, kinds: np.ndarray, periods: np.ndarray
+) -> np.ndarray:
+    """Compute one moving average per (kind, period) pair into rows of out"""
+    n = x.shape[0]
+    k = periods.shape[0]
+    out = np.full((k, n), np.nan)
+    begin = _first_valid(x)
+
+    for j in range(k):
+        if kinds[j] == MA_SMA:
+            _sma(x, periods[j], begin, out[j])
+        elif kinds[j] == MA_EMA:
+            _ema(x, periods[j], begin, out[j])
+        else:
+            _wma(x, periods[j], begin, out[j])
+
+    return out
+
+
+def moving_averages(
+    x: np.ndarray, kinds: Sequence[int], periods: Sequence[int]
+) -> List[np.ndarray]:
+    """
+    Compute several moving averages of x
+
+    Args:
+        x: float64 input array
+        kinds: MA_SMA / MA_EMA / MA_WMA for each output
+        periods: Period for each output
+
+    Returns:
+        List of arrays, one per (kind, period) pair
+    """
+    if not NUMBA_AVAILABLE:
+        return [_FALLBACK_FUNCS[kind](x, period) for kind, period in zip(kinds, periods)]
+
+    out = moving_averages_kernel(
+        x,
+        np.asarray(kinds, dtype=np.int64),
+        np.asarray(periods, dtype=np.int64),
+    )
+    return list(out)
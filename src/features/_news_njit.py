@@ -0,0 +1,95 @@
+"""
+News Window Kernels
+===================
+Sentiment statistics of the articles in a trailing time window, for every
+price bar, compiled with Numba.
+
+Usage:
+    from src.features._news_njit import window_sentiment_stats
+
+    window_sentiment_stats(
+        news_ts, polarity, is_pos, is_neg, is_neu, price_ts, window_ns, out
+    )
+
+News timestamps must be sorted; each bar's window [t - window, t] is found
+by binary search, so the cost is O(n log m + total articles in windows)
+instead of a full scan of the news per bar. Columns of ``out`` follow
+SENTIMENT_STATS in news_features (NaN polarities are skipped like pandas
+does). The kernel releases the GIL, so windows can be filled from several
+threads at once.
+"""
+
+import numpy as np
+
+from ._njit import njit
+
+NAT = np.iinfo(np.int64).min
+
+
+# nogil: add_sentiment_features runs one window per thread. Not parallel=True,
+# whose workqueue layer can't be entered from several threads.
+@njit(cache=True, nogil=True)
+def window_sentiment_stats(
+    news_ts: np.ndarray,
+    polarity: np.ndarray,
+    is_pos: np.ndarray,
+    is_neg: np.ndarray,
+    is_neu: np.ndarray,
+    price_ts: np.ndarray,
+    window_ns: int,
+    out: np.ndarray,
+) -> None:
+    """Fill out (n, 11) with the stats of the news in each bar's window"""
+    for i in range(price_ts.shape[0]):
+        out[i, :] = 0.0
+        t = price_ts[i]
+        if t == NAT:
+            continue
+
+        start = np.searchsorted(news_ts, t - window_ns, side="left")
+        end = np.searchsorted(news_ts, t, side="right")
+        count = end - start
+        if count <= 0:
+            continue
+
+        valid = 0
+        total = 0.0
+        high = -np.inf
+        low = np.inf
+        positive = 0
+        negative = 0
+        neutral = 0
+        for j in range(start, end):
+            x = polarity[j]
+            if not np.isnan(x):
+                valid += 1
+                total += x
+                high = max(high, x)
+                low = min(low, x)
+            positive += is_pos[j]
+            negative += is_neg[j]
+            neutral += is_neu[j]
+
+        mean = total / valid if valid > 0 else np.nan
+        std = 0.0
+        if count > 1:
+            std = np.nan
+            if valid > 1:
+                ss = 0.0
+                for j in range(start, end):
+                    x = polarity[j]
+                    if not np.isnan(x):
+                        ss += (x - mean) * (x - mean)
+                std = np.sqrt(ss / (valid - 1))
+
+        out[i, 0] = count
+        out[i, 1] = mean
+        out[i, 2] = total
+        out[i, 3] = high if valid > 0 else np.nan
+        out[i, 4] = low if valid > 0 else np.nan
+        out[i, 5] = std
+        out[i, 6] = positive
+        out[i, 7] = negative
+        out[i, 8] = neutral
+        out[i, 9] = positive / count
+        out[i, 10] = negative / count
@@ -0,0 +1,31 @@
+"""
+Numba Helpers
+=============
+Optional Numba JIT support for feature kernels.
+
+When numba is not installed, ``njit`` becomes a no-op decorator and
+``prange`` falls back to ``range``, so kernels still run as plain Python.
+Callers that have a faster pandas/TA-Lib equivalent should check
+``NUMBA_AVAILABLE`` and use that path instead.
+"""
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op replacement for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+__all__ = ["njit", "prange", "NUMBA_AVAILABLE"]
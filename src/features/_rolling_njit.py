@@ -0,0 +1,236 @@
+"""
+Rolling Window Kernels
+======================
+O(n) rolling extrema using a monotonic deque, compiled with Numba.
+
+Usage:
+    from src.features._rolling_njit import rolling_max, rolling_min
+
+    upper = rolling_max(high, 20)
+    lower = rolling_min(low, 20)
+
+Results match ``pd.Series.rolling(window).max()/min()``: the first
+``window - 1`` values are NaN, as is any window containing a NaN.
+"""
+
+import numpy as np
+import pandas as pd
+
+from ._njit import NUMBA_AVAILABLE, njit
+
+
+@njit(cache=True)
+def rolling_max_deque(a: np.ndarray, window: int) -> np.ndarray:
+    """Rolling max keeping a deque of indices with decreasing values"""
+    n = a.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    dq = np.empty(n, dtype=np.int64)
+    head = 0
+    tail = 0
+    nan_count = 0
+
+    for i in range(n):
+        x = a[i]
+        if np.isnan(x):
+            nan_count += 1
+        else:
+            while tail > head and a[dq[tail - 1]] <= x:
+                tail -= 1
+            dq[tail] = i
+            tail += 1
+
+        if i >= window and np.isnan(a[i - window]):
+            nan_count -= 1
+
+        # Drop indices that fell out of the window
+        while tail > head and dq[head] <= i - window:
+            head += 1
+
+        if i < window - 1 or nan_count > 0:
+            out[i] = np.nan
+        else:
+            out[i] = a[dq[head]]
+
+    return out
+
+
+@njit(cache=True)
+def rolling_min_deque(a: np.ndarray, window: int) -> np.ndarray:
+    """Rolling min keeping a deque of indices with increasing values"""
+    n = a.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    dq = np.empty(n, dtype=np.int64)
+    head = 0
+    tail = 0
+    nan_count = 0
+
+    for i in range(n):
+        x = a[i]
+        if np.isnan(x):
+            nan_count += 1
+        else:
+            while tail > head and a[dq[tail - 1]] >= x:
+                tail -= 1
+            dq[tail] = i
+            tail += 1
+
+        if i >= window and np.isnan(a[i - window]):
+            nan_count -= 1
+
+        # Drop indices that fell out of the window
+        while tail > head and dq[head] <= i - window:
+            head += 1
+
+        if i < window - 1 or nan_count > 0:
+            out[i] = np.nan
+        else:
+            out[i] = a[dq[head]]
+
+    return out
+
+
+def rolling_max(a: np.ndarray, window: int) -> np.ndarray:
+    """Rolling max (Numba deque if available, pandas otherwise)"""
+    a = np.ascontiguousarray(a, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        return rolling_max_deque(a, window)
+    return pd.Series(a).rolling(window=window).max().to_numpy()
+
+
+def rolling_min(a: np.ndarray, window: int) -> np.ndarray:
+    """Rolling min (Numba deque if available, pandas otherwise)"""
+    a = np.ascontiguousarray(a, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        return rolling_min_deque(a, window)
+    return pd.Series(a).rolling(window=window).min().to_numpy()
+
+
+# No fastmath: it lets LLVM assume values are never NaN, which breaks the
+# NaN-window handling below
+@njit(cache=True)
+def rolling_moments_kernel(x: np.ndarray, window: int):
+    """
+    Rolling mean, std, skew and kurtosis in a single pass
+
+    Keeps running power sums of the values (shifted towards the window
+    mean for numerical stability), adding the new value and removing the
+    one leaving the window. std uses ddof=1; skew and kurt use the same
+    bias-corrected estimators as pandas.
+    """
+    n = x.shape[0]
+    mean = np.full(n, np.nan)
+    std = np.full(n, np.nan)
+    skew = np.full(n, np.nan)
+    kurt = np.full(n, np.nan)
+
+    shift = 0.0
+    for i in range(n):
+        if not np.isnan(x[i]):
+            shift = x[i]
+            break
+
+    s1 = 0.0
+    s2 = 0.0
+    s3 = 0.0
+    s4 = 0.0
+    nobs = 0
+    same_run = 0
+    prev = np.nan
+
+    for i in range(n):
+        val = x[i]
+        if not np.isnan(val):
+            d = val - shift
+            d2 = d * d
+            s1 += d
+            s2 += d2
+            s3 += d2 * d
+            s4 += d2 * d2
+            nobs += 1
+
+        # Length of the run of identical values ending at i
+        if val == prev:
+            same_run += 1
+        else:
+            same_run = 1
+        prev = val
+
+        if i >= window:
+            old = x[i - window]
+            if not np.isnan(old):
+                d = old - shift
+                d2 = d * d
+                s1 -= d
+                s2 -= d2
+                s3 -= d2 * d
+                s4 -= d2 * d2
+                nobs -= 1
+
+        # Once per window, re-center the sums on the current window mean so
+        # a drifting series (e.g. prices) doesn't lose precision
+        if i % window == window - 1 and nobs > 0:
+            shift += s1 / nobs
+            s1 = 0.0
+            s2 = 0.0
+            s3 = 0.0
+            s4 = 0.0
+            for j in range(i - window + 1, i + 1):
+                if not np.isnan(x[j]):
+                    d = x[j] - shift
+                    d2 = d * d
+                    s1 += d
+                    s2 += d2
+                    s3 += d2 * d
+                    s4 += d2 * d2
+
+        if nobs < window:
+            continue
+
+        dn = float(nobs)
+        a = s1 / dn
+        mean[i] = a + shift
+
+        if same_run >= nobs:
+            std[i] = 0.0
+            skew[i] = 0.0
+            kurt[i] = -3.0
+            continue
+
+        # Central moments from the raw power sums
+        b = s2 / dn - a * a
+        c = s3 / dn - a * a * a - 3.0 * a * b
+        e = s4 / dn - a * a * a * a - 6.0 * b * a * a - 4.0 * c * a
+
+        std[i] = np.sqrt(max(b, 0.0) * dn / (dn - 1.0)) if nobs > 1 else np.nan
+
+        if b <= 1e-14:
+            continue
+
+        if nobs >= 3:
+            r = np.sqrt(b)
+            skew[i] = np.sqrt(dn * (dn - 1.0)) * c / ((dn - 2.0) * r * r * r)
+
+        if nobs >= 4:
+            k = (dn * dn - 1.0) * e / (b * b) - 3.0 * ((dn - 1.0) ** 2)
+            kurt[i] = k / ((dn - 2.0) * (dn - 3.0))
+
+    return mean, std, skew, kurt
+
+
+def rolling_moments(x: np.ndarray, window: int):
+    """
+    Rolling (mean, std, skew, kurt) arrays
+
+    Uses the one-pass Numba kernel when available, pandas otherwise.
+    """
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        return rolling_moments_kernel(x, window)
+
+    rolling = pd.Series(x).rolling(window=window)
+    return (
+        rolling.mean().to_numpy(),
+        rolling.std().to_numpy(),
+        rolling.skew().to_numpy(),
+        rolling.kurt().to_numpy(),
+    )
@@ -0,0 +1,305 @@
+"""
+Time Feature Kernels
+====================
+All time features of TimeFeatures computed from int64 ns timestamps in one
+pass, with calendar fields decomposed arithmetically (no pandas ``.dt``).
+
+Usage:
+    from src.features._time_njit import TIME_FEATURE_COLUMNS, time_features
+
+    tables = (flag_table, flag_cols, cyclical_table)
+    out = time_features(ts_ns, *tables)  # (n, F)
+    out = time_features_batch(ts_ns_2d, *tables)  # (T, K, F)
+
+Timestamps are interpreted as wall-clock time (naive / UTC). NaT rows come
+out like the pandas ``.dt`` version: NaN components, 0 indicators and the
+after-hours main_session.
+"""
+
+import numpy as np
+
+from ._njit import njit, prange
+
+TIME_FEATURE_COLUMNS = [
+    # Basic
+    "hour",
+    "day_of_week",
+    "day_of_month",
+    "week_of_year",
+    "month",
+    "quarter",
+    "year",
+    "is_weekend",
+    "is_monday",
+    "is_friday",
+    "is_month_start",
+    "is_month_end",
+    "is_quarter_start",
+    "is_quarter_end",
+    # Sessions
+    "session_sydney",
+    "session_tokyo",
+    "session_london",
+    "session_newyork",
+    "overlap_london_newyork",
+    "overlap_tokyo_london",
+    "main_session",
+    # Market hours
+    "is_liquid_hours",
+    "is_low_liquidity",
+    "is_peak_hours",
+    "hours_since_london_open",
+    "hours_since_ny_open",
+    # Cyclical
+    "hour_sin",
+    "hour_cos",
+    "day_sin",
+    "day_cos",
+    "dom_sin",
+    "dom_cos",
+    "month_sin",
+    "month_cos",
+    # Time since events
+    "minutes_since_midnight",
+    "time_of_day_normalized",
+    "days_since_month_start",
+    "days_to_month_end",
+    # Special periods
+    "is_first_hour_london",
+    "is_last_hour_ny",
+    "is_first_day_of_week",
+    "is_last_day_of_week",
+    "is_first_5_days",
+    "is_last_5_days",
+    "week_of_month",
+]
+
+# Column dtypes when unpacking the float32 kernel output (int8 otherwise)
+TIME_FEATURE_DTYPES = {
+    "year": np.int16,
+    "minutes_since_midnight": np.int16,
+    "time_of_day_normalized": np.float32,
+    **{
+        f"{name}_{fn}": np.float32
+        for name in ("hour", "day", "dom", "month")
+        for fn in ("sin", "cos")
+    },
+}
+
+NS_PER_DAY = 86_400_000_000_000
+NS_PER_MINUTE = 60_000_000_000
+NAT = np.iinfo(np.int64).min
+
+
+@njit(cache=True)
+def civil_from_days(z: int):
+    """(year, month, day) of a day count since 1970-01-01 (proleptic Gregorian)"""
+    z += 719468
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + 3 if mp < 10 else mp - 9
+    year = yoe + era * 400 + (1 if month <= 2 else 0)
+    return year, month, day
+
+
+@njit(cache=True)
+def days_from_civil(year: int, month: int, day: int) -> int:
+    """Day count since 1970-01-01 of a (year, month, day) date"""
+    year -= 1 if month <= 2 else 0
+    era = year // 400
+    yoe = year - era * 400
+    mp = month - 3 if month > 2 else month + 9
+    doy = (153 * mp + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+@njit(cache=True)
+def days_in_month(year: int, month: int) -> int:
+    """Days in a month, Gregorian leap years included"""
+    if month == 2:
+        leap = (year % 4 == 0 and year % 100 != 0) or year % 400 == 0
+        return 29 if leap else 28
+    if month == 4 or month == 6 or month == 9 or month == 11:
+        return 30
+    return 31
+
+
+@njit(cache=True)
+def fill_time_features(
+    ts: int,
+    flag_table: np.ndarray,
+    flag_cols: np.ndarray,
+    cyclical_table: np.ndarray,
+    out: np.ndarray,
+) -> None:
+    """Write every TIME_FEATURE_COLUMNS value of one timestamp into out"""
+    if ts == NAT:
+        # NaN compares False, so every 0/1 indicator is 0 and main_session
+        # lands in the last bin
+        out[:] = np.nan
+        out[7:14] = 0
+        for j in range(flag_cols.shape[0]):
+            out[flag_cols[j]] = 0
+        out[20] = 4
+        out[40:44] = 0
+        return
+
+    days = ts // NS_PER_DAY
+    minutes = (ts - days * NS_PER_DAY) // NS_PER_MINUTE
+    hour = minutes // 60
+    year, month, day = civil_from_days(days)
+    dow = (days + 3) % 7  # 1970-01-01 was a Thursday; Monday=0
+    dim = days_in_month(year, month)
+
+    # ISO week: the week containing this week's Thursday
+    thursday = days - dow + 3
+    iso_year = civil_from_days(thursday)[0]
+    week = (thursday - days_from_civil(iso_year, 1, 1)) // 7 + 1
+
+    # Basic
+    out[0] = hour
+    out[1] = dow
+    out[2] = day
+    out[3] = week
+    out[4] = month
+    out[5] = (month - 1) // 3 + 1
+    out[6] = year
+    out[7] = dow >= 5
+    out[8] = dow == 0
+    out[9] = dow == 4
+    out[10] = day == 1
+    out[11] = day == dim
+    out[12] = day == 1 and (month - 1) % 3 == 0
+    out[13] = day == dim and month % 3 == 0
+
+    # Sessions / market hours / first-last hour flags
+    for j in range(flag_cols.shape[0]):
+        out[flag_cols[j]] = flag_table[hour, j]
+
+    if hour < 8:
+        out[20] = 1  # Asian
+    elif hour < 13:
+        out[20] = 2  # European
+    elif hour < 22:
+        out[20] = 3  # US
+    else:
+        out[20] = 4  # After-hours
+    out[24] = (hour + 16) % 24  # hours since London open (08:00)
+    out[25] = (hour + 11) % 24  # hours since NY open (13:00)
+
+    # Cyclical: table lookups, no trig per row
+    out[26] = cyclical_table[0, hour]
+    out[27] = cyclical_table[1, hour]
+    out[28] = cyclical_table[2, dow]
+    out[29] = cyclical_table[3, dow]
+    out[30] = cyclical_table[4, day]
+    out[31] = cyclical_table[5, day]
+    out[32] = cyclical_table[6, month]
+    out[33] = cyclical_table[7, month]
+
+    # Time since events
+    out[34] = minutes
+    out[35] = minutes / (24 * 60)
+    out[36] = day - 1
+    out[37] = dim - day
+
+    # Special periods
+    out[40] = dow == 0
+    out[41] = dow == 4
+    out[42] = day <= 5
+    out[43] = day >= dim - 5
+    out[44] = (day - 1) // 7 + 1
+
+
+@njit(parallel=True, cache=True)
+def time_features_kernel(
+    ts: np.ndarray,
+    flag_table: np.ndarray,
+    flag_cols: np.ndarray,
+    cyclical_table: np.ndarray,
+    out: np.ndarray,
+) -> None:
+    """Fill out (n, F) from ts (n,) in a single fused pass over the rows"""
+    for i in prange(ts.shape[0]):
+        fill_time_features(ts[i], flag_table, flag_cols, cyclical_table, out[i])
+
+
+@njit(parallel=True, cache=True)
+def time_features_batch_kernel(
+    ts: np.ndarray,
+    flag_table: np.ndarray,
+    flag_cols: np.ndarray,
+    cyclical_table: np.ndarray,
+    out: np.ndarray,
+) -> None:
+    """Fill out (T, K, F) from ts (T, K), one series per parallel iteration"""
+    for k in prange(ts.shape[1]):
+        for t in range(ts.shape[0]):
+            fill_time_features(
+                ts[t, k], flag_table, flag_cols, cyclical_table, out[t, k]
+            )
+
+
+def time_features(
+    ts: np.ndarray,
+    flag_table: np.ndarray,
+    flag_cols: np.ndarray,
+    cyclical_table: np.ndarray,
+) -> np.ndarray:
+    """
+    Compute time features for a 1-D array of int64 ns timestamps
+
+    Args:
+        ts: int64 ns since epoch, shape (n,)
+        flag_table: (24, J) int8 table, flag_table[h, j] = flag j at hour h
+        flag_cols: Output column index of each of the J hour flags
+        cyclical_table: (8, M) float32 sin/cos table, one row per cyclical
+                        column (hour_sin ... month_cos) indexed by value
+
+    Returns:
+        np.ndarray: float32 array of shape (n, len(TIME_FEATURE_COLUMNS))
+    """
+    out = np.empty((len(ts), len(TIME_FEATURE_COLUMNS)), dtype=np.float32)
+    time_features_kernel(
+        np.ascontiguousarray(ts, dtype=np.int64),
+        flag_table,
+        flag_cols,
+        cyclical_table,
+        out,
+    )
+    return out
+
+
+def time_features_batch(
+    ts: np.ndarray,
+    flag_table: np.ndarray,
+    flag_cols: np.ndarray,
+    cyclical_table: np.ndarray,
+) -> np.ndarray:
+    """
+    Compute time features for a (T, K) array of int64 ns timestamps
+
+    Args:
+        ts: int64 ns since epoch, shape (T, K) - one column per series
+        flag_table: (24, J) int8 table, flag_table[h, j] = flag j at hour h
+        flag_cols: Output column index of each of the J hour flags
+        cyclical_table: (8, M) float32 sin/cos table, one row per cyclical
+                        column (hour_sin ... month_cos) indexed by value
+
+    Returns:
+        np.ndarray: float32 array of shape (T, K, len(TIME_FEATURE_COLUMNS))
+    """
+    out = np.empty(ts.shape + (len(TIME_FEATURE_COLUMNS),), dtype=np.float32)
+    time_features_batch_kernel(
+        np.ascontiguousarray(ts, dtype=np.int64),
+        flag_table,
+        flag_cols,
+        cyclical_table,
+        out,
+    )
+    return out
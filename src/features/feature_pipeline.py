@@ -124,7 +124,7 @@ class FeaturePipeline:
 
         # Add time features
         print("\n[2]  Time-Based Features")
-        df = self.time_features.add_all_time_features(df)
+        df = self.time_features.add_all_time_features(df, verbose=True)
         time_cols = len(df.columns)
         self.stats["time_features"] = time_cols - tech_cols
 
@@ -400,6 +400,10 @@ class FeaturePipeline:
         # Add features
         df = self.add_features(df)
 
+        # The pipeline is reused across files: don't keep this file's time
+        # feature blocks alive
+        self.time_features.clear_cache()
+
         # Handle missing values
         df = self.handle_missing_values(df, method=missing_method)
 
@@ -9,13 +9,34 @@ Features:
 - คำนวณ sentiment momentum และ trends
 """
 
-from datetime import datetime, timedelta
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+from ._news_njit import window_sentiment_stats
+
+logger = logging.getLogger(__name__)
+
+# ลำดับของ statistics ที่ window_sentiment_stats เขียน (หนึ่ง column ต่อ stat)
+SENTIMENT_STATS = [
+    "news_count",
+    "sentiment_avg",
+    "sentiment_sum",
+    "sentiment_max",
+    "sentiment_min",
+    "sentiment_std",
+    "positive_count",
+    "negative_count",
+    "neutral_count",
+    "positive_ratio",
+    "negative_ratio",
+]
+
 
 class NewsSentimentFeatures:
     """
@@ -26,19 +47,45 @@ class NewsSentimentFeatures:
         """Initialize News Sentiment Features"""
         self.news_data = None
 
+    @staticmethod
+    def warmup():
+        """
+        compile (หรือโหลดจาก cache) kernel ของ sentiment window ล่วงหน้า
+        ด้วยข้อมูลหลอก 10 แถว เพื่อให้การรวมข้อมูลจริงครั้งแรกไม่ต้องรอ JIT
+        """
+        ts = np.arange(10, dtype=np.int64)
+        flags = np.zeros(10, dtype=np.int64)
+        # add_sentiment_features ส่ง out เป็น slice ของ column (layout 'A')
+        # จึงต้อง warm ด้วย slice แบบเดียวกัน ไม่ใช่ array C-contiguous
+        n_stats = len(SENTIMENT_STATS)
+        window_sentiment_stats(
+            ts,
+            np.zeros(10),
+            flags,
+            flags,
+            flags,
+            ts,
+            1,
+            np.empty((10, 2 * n_stats), dtype=np.float32)[:, :n_stats],
+        )
+
     def load_news(self, news_path: str) -> pd.DataFrame:
         """
         โหลดข้อมูลข่าว
 
         Args:
-            news_path: path ไปยังไฟล์ข่าว
+            news_path: path ไปยังไฟล์ข่าว (.csv หรือ .parquet)
 
         Returns:
             DataFrame ของข่าว
         """
         try:
-            df = pd.read_csv(news_path)
-            df["timestamp"] = pd.to_datetime(df["timestamp"])
+            if str(news_path).endswith(".parquet"):
+                df = pd.read_parquet(news_path)
+            else:
+                df = pd.read_csv(news_path)
+            df["timestamp"] = self._to_naive_utc(df["timestamp"])
+            df = self.add_sentiment_flags(df)
 
             print(f"✅ Loaded {len(df)} news articles")
             print(f"   Date range: {df['timestamp'].min()} to {df['timestamp'].max()}")
@@ -50,6 +97,55 @@ class NewsSentimentFeatures:
             print(f"❌ Error loading news: {e}")
             return pd.DataFrame()
 
+    @staticmethod
+    def _to_naive_utc(timestamps: pd.Series) -> pd.Series:
+        """แปลง timestamp เป็น UTC แบบไม่มี timezone (เวลาที่ไม่มี tz ถือเป็น UTC)"""
+        return pd.to_datetime(timestamps, utc=True).dt.tz_convert(None)
+
+    def add_sentiment_flags(self, df_news: pd.DataFrame) -> pd.DataFrame:
+        """
+        เพิ่ม column is_pos / is_neg / is_neu (คำนวณครั้งเดียวตอนโหลดข่าว)
+
+        Args:
+            df_news: DataFrame ของข่าว (ต้องมี column 'sentiment')
+
+        Returns:
+            DataFrame with sentiment flag columns
+        """
+        sentiments = df_news["sentiment"]
+        df_news["is_pos"] = (sentiments == "positive").to_numpy()
+        df_news["is_neg"] = (sentiments == "negative").to_numpy()
+        df_news["is_neu"] = (sentiments == "neutral").to_numpy()
+        return df_news
+
+    def _news_arrays(self, df_news: pd.DataFrame) -> Tuple[np.ndarray, ...]:
+        """
+        เตรียม arrays ของข่าวสำหรับ window_sentiment_stats
+
+        ข่าวที่ไม่ได้มาจาก load_news จะถูก normalize timestamp และเพิ่ม flag
+        columns ก่อน แล้วเรียงข่าวตามเวลา (ข่าวที่ไม่มีเวลาไม่อยู่ใน window
+        ใดอยู่แล้ว) เพื่อหาขอบของแต่ละ window ด้วย binary search
+
+        Returns:
+            (news_ts, polarity, is_pos, is_neg, is_neu)
+        """
+        # ข่าวที่ไม่ได้มาจาก load_news อาจยังไม่ได้ normalize
+        if "is_pos" not in df_news.columns or df_news["timestamp"].dtype != "<M8[ns]":
+            df_news = df_news.copy()
+            df_news["timestamp"] = self._to_naive_utc(df_news["timestamp"])
+            df_news = self.add_sentiment_flags(df_news)
+
+        df_news = df_news.dropna(subset=["timestamp"]).sort_values(
+            "timestamp", kind="stable"
+        )
+        return (
+            df_news["timestamp"].to_numpy("datetime64[ns]").view(np.int64),
+            df_news["polarity"].to_numpy(np.float64),
+            df_news["is_pos"].to_numpy(np.int64),
+            df_news["is_neg"].to_numpy(np.int64),
+            df_news["is_neu"].to_numpy(np.int64),
+        )
+
     def aggregate_sentiment(
         self, df_news: pd.DataFrame, timestamp: datetime, window_hours: int = 24
     ) -> Dict:
@@ -58,65 +154,24 @@ class NewsSentimentFeatures:
 
         Args:
             df_news: DataFrame ของข่าว
-            timestamp: เวลาที่ต้องการคำนวณ
+            timestamp: เวลาที่ต้องการคำนวณ (UTC ไม่มี timezone เหมือนข่าว)
             window_hours: ช่วงเวลาย้อนหลัง (ชั่วโมง)
 
         Returns:
             Dict with aggregated sentiment
         """
-        # แปลง timestamp ให้เป็น timezone-aware ถ้าข่าวมี timezone
-        if df_news["timestamp"].dt.tz is not None:
-            # ถ้าข่าวมี timezone แต่ timestamp ไม่มี
-            if not hasattr(timestamp, "tzinfo") or timestamp.tzinfo is None:
-                timestamp = pd.Timestamp(timestamp).tz_localize("UTC")
-        else:
-            # ถ้าข่าวไม่มี timezone แต่ timestamp มี
-            if hasattr(timestamp, "tzinfo") and timestamp.tzinfo is not None:
-                timestamp = timestamp.tz_localize(None)
-
-        # กรองข่าวในช่วงเวลาที่กำหนด
-        start_time = timestamp - timedelta(hours=window_hours)
-        mask = (df_news["timestamp"] >= start_time) & (
-            df_news["timestamp"] <= timestamp
+        # ใช้ kernel เดียวกับ add_sentiment_features กับ timestamp เดียว
+        out = np.empty((1, len(SENTIMENT_STATS)))
+        window_sentiment_stats(
+            *self._news_arrays(df_news),
+            np.array([pd.Timestamp(timestamp).value], dtype=np.int64),
+            int(pd.Timedelta(hours=window_hours).value),
+            out,
         )
-        news_window = df_news[mask]
-
-        if len(news_window) == 0:
-            return {
-                "news_count": 0,
-                "sentiment_avg": 0.0,
-                "sentiment_sum": 0.0,
-                "sentiment_max": 0.0,
-                "sentiment_min": 0.0,
-                "sentiment_std": 0.0,
-                "positive_count": 0,
-                "negative_count": 0,
-                "neutral_count": 0,
-                "positive_ratio": 0.0,
-                "negative_ratio": 0.0,
-            }
-
-        # คำนวณ statistics
-        polarities = news_window["polarity"]
-        sentiments = news_window["sentiment"]
-
-        positive_count = (sentiments == "positive").sum()
-        negative_count = (sentiments == "negative").sum()
-        neutral_count = (sentiments == "neutral").sum()
-        total_count = len(news_window)
 
         return {
-            "news_count": total_count,
-            "sentiment_avg": polarities.mean(),
-            "sentiment_sum": polarities.sum(),
-            "sentiment_max": polarities.max(),
-            "sentiment_min": polarities.min(),
-            "sentiment_std": polarities.std() if total_count > 1 else 0.0,
-            "positive_count": positive_count,
-            "negative_count": negative_count,
-            "neutral_count": neutral_count,
-            "positive_ratio": positive_count / total_count if total_count > 0 else 0.0,
-            "negative_ratio": negative_count / total_count if total_count > 0 else 0.0,
+            stat: int(value) if stat.endswith("_count") else value
+            for stat, value in zip(SENTIMENT_STATS, out[0].tolist())
         }
 
     def add_sentiment_features(
@@ -151,24 +206,43 @@ class NewsSentimentFeatures:
         print(f"   Price data: {len(df)} rows")
         print(f"   News data: {len(df_news)} articles")
 
-        # สำหรับแต่ละ window
-        for window in windows:
-            print(f"   Processing {window}h window...")
-
-            # สร้าง features สำหรับแต่ละแถว
-            features = []
-            for timestamp in df["timestamp"]:
-                sent_stats = self.aggregate_sentiment(df_news, timestamp, window)
-                features.append(sent_stats)
+        news_arrays = self._news_arrays(df_news)
 
-            # แปลงเป็น DataFrame
-            df_features = pd.DataFrame(features)
+        # จองพื้นที่ features ทั้งหมดไว้ล่วงหน้า (float32) แล้วเติมทีละ window
+        n_stats = len(SENTIMENT_STATS)
+        out = np.empty((len(df), n_stats * len(windows)), dtype=np.float32)
+        names = [
+            f"news_{window}h_{stat}" for window in windows for stat in SENTIMENT_STATS
+        ]
 
-            # เพิ่ม prefix ตาม window
-            df_features = df_features.add_prefix(f"news_{window}h_")
+        # normalize timezone ครั้งเดียวสำหรับทุก window
+        price_ts = (
+            self._to_naive_utc(df["timestamp"])
+            .to_numpy("datetime64[ns]")
+            .view(np.int64)
+        )
 
-            # รวมเข้ากับ df หลัก
-            df = pd.concat([df, df_features], axis=1)
+        # แต่ละ window เขียนคนละช่วง column ของ out และ kernel ปล่อย GIL
+        # จึงคำนวณพร้อมกันได้ (หนึ่ง thread ต่อ window)
+        with ThreadPoolExecutor(max_workers=max(len(windows), 1)) as executor:
+            futures = []
+            for slot, window in enumerate(windows):
+                logger.info("Processing %dh window...", window)
+                futures.append(
+                    executor.submit(
+                        window_sentiment_stats,
+                        *news_arrays,
+                        price_ts,
+                        int(pd.Timedelta(hours=window).value),
+                        out[:, slot * n_stats : (slot + 1) * n_stats],
+                    )
+                )
+            for future in futures:
+                future.result()
+
+        # รวมเข้ากับ df หลัก
+        df_features = pd.DataFrame(out, columns=names, index=df.index)
+        df = pd.concat([df, df_features], axis=1, copy=False)
 
         print(f"\n✅ Added sentiment features for {len(windows)} time windows")
         print(f"   Total features now: {len(df.columns)}")
@@ -227,6 +301,25 @@ class NewsSentimentFeatures:
         # โหลดข่าว
         df_news = self.load_news(news_path)
 
+        return self.merge_price_and_news_df(df_price, df_news, windows)
+
+    def merge_price_and_news_df(
+        self,
+        df_price: pd.DataFrame,
+        df_news: pd.DataFrame,
+        windows: list = [1, 4, 12, 24, 48],
+    ) -> pd.DataFrame:
+        """
+        รวมข้อมูลราคากับข่าวที่โหลดไว้แล้ว (ไม่ต้องอ่านไฟล์ข่าวซ้ำทุกครั้ง)
+
+        Args:
+            df_price: DataFrame ของราคา
+            df_news: DataFrame ของข่าว (เช่นจาก load_news)
+            windows: รายการช่วงเวลา
+
+        Returns:
+            DataFrame with price and sentiment features
+        """
         if df_news.empty:
             print("⚠️ No news data available. Skipping sentiment features.")
             return df_price
@@ -327,7 +420,9 @@ def main():
     print("📊 COMBINED DATA SAMPLE")
     print("=" * 70)
 
-    sentiment_cols = [col for col in df_combined.columns if "news_" in col]
+    sentiment_cols = df_combined.columns[
+        df_combined.columns.str.startswith("news_")
+    ].tolist()
     print(f"\nSentiment columns added: {len(sentiment_cols)}")
     print(df_combined[["timestamp"] + sentiment_cols[:5]].head())
 
@@ -16,21 +16,97 @@ Usage:
     df = ti.add_all_indicators(df)
 """
 
+import os
+import re
+import sys
+import threading
 import pandas as pd
 import numpy as np
 import talib
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import groupby
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import warnings
 
+from ._ma_njit import MA_EMA, MA_SMA, MA_WMA, moving_averages
+from ._rolling_njit import rolling_max, rolling_min, rolling_moments
+
 warnings.filterwarnings("ignore")
 
 
+@dataclass
+class OHLCV:
+    """Column arrays extracted once from the input DataFrame"""
+
+    __slots__ = ("open", "high", "low", "close", "volume", "timestamp")
+
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    timestamp: Optional[pd.Series]
+
+
 class TechnicalIndicators:
     """Calculates technical indicators for trading"""
 
-    def __init__(self):
-        """Initialize Technical Indicators calculator"""
+    CANDLESTICK_PATTERNS = {
+        "DOJI": talib.CDLDOJI,
+        "HAMMER": talib.CDLHAMMER,
+        "INVERTED_HAMMER": talib.CDLINVERTEDHAMMER,
+        "SHOOTING_STAR": talib.CDLSHOOTINGSTAR,
+        "ENGULFING": talib.CDLENGULFING,
+        "HARAMI": talib.CDLHARAMI,
+        "MORNING_STAR": talib.CDLMORNINGSTAR,
+        "EVENING_STAR": talib.CDLEVENINGSTAR,
+        "THREE_WHITE_SOLDIERS": talib.CDL3WHITESOLDIERS,
+        "THREE_BLACK_CROWS": talib.CDL3BLACKCROWS,
+    }
+
+    # Substrings identifying each feature group (matched anywhere in the name)
+    FEATURE_GROUP_TOKENS = {
+        "trend": ["SMA", "EMA", "WMA", "MACD", "ADX", "SAR"],
+        "momentum": ["RSI", "STOCH", "WILLR", "ROC", "MOM", "CCI"],
+        "volatility": ["BB_", "ATR", "KELT", "DONCH", "volatility"],
+        "volume": ["VOL_", "OBV", "MFI", "VWAP"],
+        "patterns": ["PATTERN_"],
+        "price_action": [
+            "HL_range",
+            "body_size",
+            "shadow",
+            "is_bullish",
+            "resistance",
+            "support",
+            "dist_to",
+        ],
+        "statistical": ["returns", "skew", "kurt", "zscore"],
+    }
+    FEATURE_GROUP_PATTERNS = {
+        group: re.compile("|".join(map(re.escape, tokens)))
+        for group, tokens in FEATURE_GROUP_TOKENS.items()
+    }
+
+    def __init__(self, max_workers: Optional[int] = None, dtype=np.float32):
+        """
+        Initialize Technical Indicators calculator
+
+        Args:
+            max_workers: Threads used to compute indicator groups
+                         (default: os.cpu_count())
+            dtype: Float dtype of derived ratio columns (%B, *_pct, dist_to_*);
+                   TA-Lib inputs and outputs stay float64
+        """
         self.required_columns = ["open", "high", "low", "close", "tick_volume"]
+        self.dtype = dtype
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._log: List[str] = []
+
+        # (indicator, period) -> ndarray (or tuple of ndarrays), shared
+        # across indicator groups within one add_all_indicators run
+        self._cache: Dict[Tuple[str, int], Any] = {}
+        self._cache_lock = threading.Lock()
 
     def validate_data(self, df: pd.DataFrame) -> bool:
         """
@@ -50,108 +126,175 @@ class TechnicalIndicators:
 
         return True
 
+    def _flush_log(self) -> None:
+        """Write the collected progress lines in a single call"""
+        if self._log:
+            sys.stdout.write("\n".join(self._log) + "\n")
+            sys.stdout.flush()
+            self._log = []
+
+    def _cached(self, indicator: str, period: int, func: Callable[[], Any]) -> Any:
+        """
+        Return a cached indicator array, computing it on first use
+
+        Args:
+            indicator: Indicator name (e.g. "EMA", "ATR")
+            period: Indicator period
+            func: Zero-argument callable that computes the array(s)
+
+        Returns:
+            Indicator values as returned by func
+        """
+        key = (indicator, period)
+        with self._cache_lock:
+            if key in self._cache:
+                return self._cache[key]
+
+        # Computed outside the lock; a concurrent duplicate is harmless
+        values = func()
+        with self._cache_lock:
+            return self._cache.setdefault(key, values)
+
+    def _as_dtype(self, x: np.ndarray) -> np.ndarray:
+        """Cast an array to the derived-column dtype (no copy if it matches)"""
+        return x.astype(self.dtype, copy=False)
+
+    def _prepare_arrays(self, df: pd.DataFrame) -> OHLCV:
+        """
+        Extract OHLCV columns as contiguous float64 arrays
+
+        Args:
+            df: Validated input DataFrame
+
+        Returns:
+            OHLCV: Arrays shared by every indicator method
+        """
+        o, h, l, c, v = (
+            np.ascontiguousarray(df[col].to_numpy(dtype=np.float64))
+            for col in self.required_columns
+        )
+        timestamp = df["timestamp"] if "timestamp" in df.columns else None
+
+        return OHLCV(o, h, l, c, v, timestamp)
+
     # ========================================================================
     # TREND INDICATORS
     # ========================================================================
 
-    def add_moving_averages(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_moving_averages(self, a: OHLCV) -> Dict[str, np.ndarray]:
         """
         Add Simple and Exponential Moving Averages
 
         Periods: 5, 10, 20, 50, 100, 200
         """
-        print("  ├─ Moving Averages (SMA, EMA)...")
+        self._log.append("  ├─ Moving Averages (SMA, EMA)...")
+
+        c = a.close
+        out = {}
 
         periods = [5, 10, 20, 50, 100, 200]
 
-        for period in periods:
-            # Simple Moving Average
-            df[f"SMA_{period}"] = talib.SMA(df["close"], timeperiod=period)
+        # Simple and Exponential Moving Averages, then Weighted Moving
+        # Averages (shorter periods); all 15 in one compiled call
+        specs = [(kind, period) for period in periods for kind in ("SMA", "EMA")]
+        specs += [("WMA", period) for period in [10, 20, 50]]
 
-            # Exponential Moving Average
-            df[f"EMA_{period}"] = talib.EMA(df["close"], timeperiod=period)
+        kind_codes = {"SMA": MA_SMA, "EMA": MA_EMA, "WMA": MA_WMA}
+        values = moving_averages(
+            c,
+            [kind_codes[kind] for kind, _ in specs],
+            [period for _, period in specs],
+        )
 
-        # Weighted Moving Average (shorter periods)
-        for period in [10, 20, 50]:
-            df[f"WMA_{period}"] = talib.WMA(df["close"], timeperiod=period)
+        for (kind, period), ma in zip(specs, values):
+            out[f"{kind}_{period}"] = self._cached(kind, period, lambda: ma)
 
-        return df
+        return out
 
-    def add_macd(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_macd(self, a: OHLCV) -> Dict[str, np.ndarray]:
         """
         Add MACD (Moving Average Convergence Divergence)
 
         Returns: MACD line, Signal line, Histogram
         """
-        print("  ├─ MACD...")
+        self._log.append("  ├─ MACD...")
 
-        macd, signal, hist = talib.MACD(
-            df["close"], fastperiod=12, slowperiod=26, signalperiod=9
-        )
+        c = a.close
+        out = {}
 
-        df["MACD"] = macd
-        df["MACD_signal"] = signal
-        df["MACD_hist"] = hist
+        macd, signal, hist = talib.MACD(c, fastperiod=12, slowperiod=26, signalperiod=9)
 
-        return df
+        out["MACD"] = macd
+        out["MACD_signal"] = signal
+        out["MACD_hist"] = hist
 
-    def add_adx(self, df: pd.DataFrame) -> pd.DataFrame:
+        return out
+
+    def add_adx(self, a: OHLCV) -> Dict[str, np.ndarray]:
         """
         Add ADX (Average Directional Index)
 
         Measures trend strength
         """
-        print("  ├─ ADX...")
+        self._log.append("  ├─ ADX...")
 
-        df["ADX"] = talib.ADX(df["high"], df["low"], df["close"], timeperiod=14)
-        df["ADX_plus"] = talib.PLUS_DI(
-            df["high"], df["low"], df["close"], timeperiod=14
-        )
-        df["ADX_minus"] = talib.MINUS_DI(
-            df["high"], df["low"], df["close"], timeperiod=14
-        )
+        h, l, c = a.high, a.low, a.close
+        out = {}
 
-        return df
+        out["ADX"] = talib.ADX(h, l, c, timeperiod=14)
+        out["ADX_plus"] = talib.PLUS_DI(h, l, c, timeperiod=14)
+        out["ADX_minus"] = talib.MINUS_DI(h, l, c, timeperiod=14)
+
+        return out
 
-    def add_parabolic_sar(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_parabolic_sar(self, a: OHLCV) -> Dict[str, np.ndarray]:
         """Add Parabolic SAR (Stop and Reverse)"""
-        print("  ├─ Parabolic SAR...")
+        self._log.append("  ├─ Parabolic SAR...")
 
-        df["SAR"] = talib.SAR(df["high"], df["low"], acceleration=0.02, maximum=0.2)
+        h, l = a.high, a.low
+        out = {}
 
-        return df
+        out["SAR"] = talib.SAR(h, l, acceleration=0.02, maximum=0.2)
+
+        return out
 
     # ========================================================================
     # MOMENTUM INDICATORS
     # ========================================================================
 
-    def add_rsi(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_rsi(self, a: OHLCV) -> Dict[str, np.ndarray]:
         """
         Add RSI (Relative Strength Index)
 
         Periods: 14, 21, 28
         """
-        print("  ├─ RSI...")
+        self._log.append("  ├─ RSI...")
+
+        c = a.close
+        out = {}
 
         periods = [14, 21, 28]
 
         for period in periods:
-            df[f"RSI_{period}"] = talib.RSI(df["close"], timeperiod=period)
+            out[f"RSI_{period}"] = talib.RSI(c, timeperiod=period)
 
-        return df
+        return out
 
-    def add_stochastic(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_stochastic(self, a: OHLCV) -> Dict[str, np.ndarray]:
         """
         Add Stochastic Oscillator
 
         Returns: %K and %D lines
         """
-        print("  ├─ Stochastic...")
+        self._log.append("  ├─ Stochastic...")
+
+        h, l, c = a.high, a.low, a.close
+        out = {}
 
         slowk, slowd = talib.STOCH(
-            df["high"],
-            df["low"],
-            df["close"],
+            h,
+            l,
+            c,
             fastk_period=14,
             slowk_period=3,
             slowk_matype=0,
@@ -159,281 +302,394 @@ class TechnicalIndicators:
             slowd_matype=0,
         )
 
-        df["STOCH_K"] = slowk
-        df["STOCH_D"] = slowd
+        out["STOCH_K"] = slowk
+        out["STOCH_D"] = slowd
 
-        return df
+        return out
 
-    def add_williams_r(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_williams_r(self, a: OHLCV) -> Dict[str, np.ndarray]:
         """Add Williams %R"""
-        print("  ├─ Williams %R...")
+        self._log.append("  ├─ Williams %R...")
 
-        df["WILLR"] = talib.WILLR(df["high"], df["low"], df["close"], timeperiod=14)
+        h, l, c = a.high, a.low, a.close
+        out = {}
 
-        return df
+        out["WILLR"] = talib.WILLR(h, l, c, timeperiod=14)
+
+        return out
 
-    def add_roc(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_roc(self, a: OHLCV) -> Dict[str, np.ndarray]:
         """Add Rate of Change (ROC)"""
-        print("  ├─ ROC...")
+        self._log.append("  ├─ ROC...")
+
+        c = a.close
+        out = {}
 
         periods = [10, 20, 50]
 
         for period in periods:
-            df[f"ROC_{period}"] = talib.ROC(df["close"], timeperiod=period)
+            out[f"ROC_{period}"] = talib.ROC(c, timeperiod=period)
 
-        return df
+        return out
 
-    def add_momentum(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_momentum(self, a: OHLCV) -> Dict[str, np.ndarray]:
         """Add Momentum indicator"""
-        print("  ├─ Momentum...")
+        self._log.append("  ├─ Momentum...")
 
-        df["MOM"] = talib.MOM(df["close"], timeperiod=10)
+        c = a.close
+        out = {}
 
-        return df
+        out["MOM"] = talib.MOM(c, timeperiod=10)
+
+        return out
 
-    def add_cci(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_cci(self, a: OHLCV) -> Dict[str, np.ndarray]:
         """Add Commodity Channel Index (CCI)"""
-        print("  ├─ CCI...")
+        self._log.append("  ├─ CCI...")
 
-        df["CCI"] = talib.CCI(df["high"], df["low"], df["close"], timeperiod=14)
+        h, l, c = a.high, a.low, a.close
+        out = {}
 
-        return df
+        out["CCI"] = talib.CCI(h, l, c, timeperiod=14)
+
+        return out
 
     # ========================================================================
     # VOLATILITY INDICATORS
     # ========================================================================
 
-    def add_bollinger_bands(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_bollinger_bands(self, a: OHLCV) -> Dict[str, np.ndarray]:
         """
         Add Bollinger Bands
 
         Returns: Upper, Middle, Lower bands + %B and Bandwidth
         """
-        print("  ├─ Bollinger Bands...")
+        self._log.append("  ├─ Bollinger Bands...")
 
-        upper, middle, lower = talib.BBANDS(
-            df["close"], timeperiod=20, nbdevup=2, nbdevdn=2, matype=0
-        )
+        c = a.close
+        out = {}
+
+        upper, middle, lower = self._bbands(c)
+
+        out["BB_upper"] = upper
+        out["BB_middle"] = middle
+        out["BB_lower"] = lower
 
-        df["BB_upper"] = upper
-        df["BB_middle"] = middle
-        df["BB_lower"] = lower
+        # Band range computed once; a zero-width band gives NaN %B.
+        # Differences are taken in float64 before narrowing to self.dtype
+        range_ = self._as_dtype(upper - lower)
+        inv_range = np.full_like(range_, np.nan)
+        np.reciprocal(range_, out=inv_range, where=range_ != 0)
 
         # Bollinger Band %B (position within bands)
-        df["BB_pct_b"] = (df["close"] - lower) / (upper - lower)
+        pct_b = self._as_dtype(c - lower)
+        pct_b *= inv_range
+        out["BB_pct_b"] = pct_b
 
         # Bollinger Band Width (volatility measure)
-        df["BB_width"] = (upper - lower) / middle
+        out["BB_width"] = np.divide(range_, self._as_dtype(middle), out=range_)
 
-        return df
+        return out
+
+    def _bbands(self, c: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """20-period, 2-sigma Bollinger Bands (cached)"""
+        return self._cached(
+            "BBANDS",
+            20,
+            lambda: talib.BBANDS(c, timeperiod=20, nbdevup=2, nbdevdn=2, matype=0),
+        )
 
-    def add_atr(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_atr(self, a: OHLCV) -> Dict[str, np.ndarray]:
         """
         Add ATR (Average True Range)
 
         Periods: 14, 21
         """
-        print("  ├─ ATR...")
+        self._log.append("  ├─ ATR...")
+
+        h, l, c = a.high, a.low, a.close
+        out = {}
 
         periods = [14, 21]
 
         for period in periods:
-            df[f"ATR_{period}"] = talib.ATR(
-                df["high"], df["low"], df["close"], timeperiod=period
+            out[f"ATR_{period}"] = self._cached(
+                "ATR", period, lambda: talib.ATR(h, l, c, timeperiod=period)
             )
 
         # Normalized ATR (as % of price)
-        df["ATR_pct"] = df["ATR_14"] / df["close"] * 100
+        out["ATR_pct"] = self._as_dtype(out["ATR_14"]) / self._as_dtype(c) * 100
 
-        return df
+        return out
 
-    def add_keltner_channels(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_keltner_channels(self, a: OHLCV) -> Dict[str, np.ndarray]:
         """Add Keltner Channels (EMA ± ATR)"""
-        print("  ├─ Keltner Channels...")
+        self._log.append("  ├─ Keltner Channels...")
 
-        ema_20 = talib.EMA(df["close"], timeperiod=20)
-        atr_10 = talib.ATR(df["high"], df["low"], df["close"], timeperiod=10)
+        h, l, c = a.high, a.low, a.close
+        out = {}
 
-        df["KELT_upper"] = ema_20 + (2 * atr_10)
-        df["KELT_middle"] = ema_20
-        df["KELT_lower"] = ema_20 - (2 * atr_10)
+        # EMA_20 is shared with the moving averages group; computed by the same
+        # kernel so the result doesn't depend on which group fills the cache
+        ema_20 = self._cached("EMA", 20, lambda: moving_averages(c, [MA_EMA], [20])[0])
+        atr_10 = self._cached("ATR", 10, lambda: talib.ATR(h, l, c, timeperiod=10))
 
-        return df
+        out["KELT_upper"] = ema_20 + (2 * atr_10)
+        out["KELT_middle"] = ema_20
+        out["KELT_lower"] = ema_20 - (2 * atr_10)
 
-    def add_donchian_channels(self, df: pd.DataFrame) -> pd.DataFrame:
+        return out
+
+    def add_donchian_channels(self, a: OHLCV) -> Dict[str, np.ndarray]:
         """Add Donchian Channels (Highest high, Lowest low)"""
-        print("  ├─ Donchian Channels...")
+        self._log.append("  ├─ Donchian Channels...")
+
+        h, l = a.high, a.low
+        out = {}
 
         period = 20
 
-        df["DONCH_upper"] = df["high"].rolling(window=period).max()
-        df["DONCH_lower"] = df["low"].rolling(window=period).min()
-        df["DONCH_middle"] = (df["DONCH_upper"] + df["DONCH_lower"]) / 2
+        upper = rolling_max(h, period)
+        lower = rolling_min(l, period)
 
-        return df
+        out["DONCH_upper"] = upper
+        out["DONCH_lower"] = lower
+        out["DONCH_middle"] = (upper + lower) / 2
+
+        return out
 
     # ========================================================================
     # VOLUME INDICATORS
     # ========================================================================
 
-    def add_volume_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_volume_indicators(self, a: OHLCV) -> Dict[str, np.ndarray]:
         """Add volume-based indicators"""
-        print("  ├─ Volume Indicators...")
+        self._log.append("  ├─ Volume Indicators...")
+
+        v = a.volume
+        out = {}
+
+        volume = pd.Series(v)
 
         # Volume Moving Averages
-        df["VOL_SMA_10"] = df["tick_volume"].rolling(window=10).mean()
-        df["VOL_SMA_20"] = df["tick_volume"].rolling(window=20).mean()
-        df["VOL_SMA_50"] = df["tick_volume"].rolling(window=50).mean()
+        out["VOL_SMA_10"] = volume.rolling(window=10).mean().to_numpy()
+        out["VOL_SMA_20"] = volume.rolling(window=20).mean().to_numpy()
+        out["VOL_SMA_50"] = volume.rolling(window=50).mean().to_numpy()
 
         # Volume Ratio (current vs average)
-        df["VOL_ratio"] = df["tick_volume"] / df["VOL_SMA_20"]
+        out["VOL_ratio"] = v / out["VOL_SMA_20"]
 
-        return df
+        return out
 
-    def add_obv(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_obv(self, a: OHLCV) -> Dict[str, np.ndarray]:
         """Add On-Balance Volume (OBV)"""
-        print("  ├─ OBV...")
+        self._log.append("  ├─ OBV...")
+
+        c, v = a.close, a.volume
+        out = {}
 
-        df["OBV"] = talib.OBV(df["close"], df["tick_volume"])
+        out["OBV"] = talib.OBV(c, v)
 
         # OBV Moving Average
-        df["OBV_SMA"] = df["OBV"].rolling(window=20).mean()
+        out["OBV_SMA"] = pd.Series(out["OBV"]).rolling(window=20).mean().to_numpy()
 
-        return df
+        return out
 
-    def add_mfi(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_mfi(self, a: OHLCV) -> Dict[str, np.ndarray]:
         """Add Money Flow Index (MFI)"""
-        print("  ├─ MFI...")
+        self._log.append("  ├─ MFI...")
 
-        df["MFI"] = talib.MFI(
-            df["high"], df["low"], df["close"], df["tick_volume"], timeperiod=14
-        )
+        h, l, c, v = a.high, a.low, a.close, a.volume
+        out = {}
 
-        return df
+        out["MFI"] = talib.MFI(h, l, c, v, timeperiod=14)
 
-    def add_vwap(self, df: pd.DataFrame) -> pd.DataFrame:
+        return out
+
+    def add_vwap(self, a: OHLCV) -> Dict[str, np.ndarray]:
         """Add Volume Weighted Average Price (VWAP)"""
-        print("  ├─ VWAP...")
-
-        typical_price = (df["high"] + df["low"] + df["close"]) / 3
-
-        # VWAP for each day
-        if "timestamp" in df.columns:
-            df["date"] = pd.to_datetime(df["timestamp"]).dt.date
-            df["VWAP"] = (
-                df.groupby("date")
-                .apply(
-                    lambda x: (
-                        x["tick_volume"] * (x["high"] + x["low"] + x["close"]) / 3
-                    ).cumsum()
-                    / x["tick_volume"].cumsum()
-                )
-                .reset_index(level=0, drop=True)
-            )
-            df.drop("date", axis=1, inplace=True)
+        self._log.append("  ├─ VWAP...")
+
+        h, l, c, v = a.high, a.low, a.close, a.volume
+        out = {}
+
+        typical_price = (h + l + c) / 3
+
+        tpv = v * typical_price
+
+        # VWAP for each day: running sums reset at the start of every date
+        if a.timestamp is not None:
+            codes = pd.factorize(pd.to_datetime(a.timestamp).dt.date.to_numpy())[0]
+            if len(codes) > 1 and (np.diff(codes) < 0).any():
+                # Rows are not grouped by date; accumulate in date order
+                order = np.argsort(codes, kind="stable")
+                vwap = np.empty_like(tpv)
+                vwap[order] = self._cumsum_reset(tpv[order], v[order], codes[order])
+            else:
+                vwap = self._cumsum_reset(tpv, v, codes)
+            vwap[codes < 0] = np.nan
+            out["VWAP"] = vwap
         else:
             # Simple VWAP without date grouping
-            df["VWAP"] = (df["tick_volume"] * typical_price).cumsum() / df[
-                "tick_volume"
-            ].cumsum()
+            out["VWAP"] = np.cumsum(tpv) / np.cumsum(v)
 
-        return df
+        return out
+
+    @staticmethod
+    def _cumsum_reset(tpv: np.ndarray, v: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Cumulative tpv / cumulative volume, restarting whenever codes changes"""
+        # Skip NaN terms like pandas' cumsum, so a missing bar only blanks
+        # its own row instead of every later bar
+        cum_tpv = np.nancumsum(tpv)
+        cum_v = np.nancumsum(v)
+
+        is_start = np.r_[True, np.diff(codes) != 0]
+        starts = np.flatnonzero(is_start)
+        base = starts[np.cumsum(is_start) - 1] - 1
+
+        # Subtract the running total accumulated before each run began
+        offset_tpv = np.where(base >= 0, cum_tpv[base], 0.0)
+        offset_v = np.where(base >= 0, cum_v[base], 0.0)
+        vwap = (cum_tpv - offset_tpv) / (cum_v - offset_v)
+        vwap[np.isnan(tpv)] = np.nan
+        return vwap
 
     # ========================================================================
     # PATTERN RECOGNITION
     # ========================================================================
 
-    def add_candlestick_patterns(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_candlestick_patterns(self, a: OHLCV) -> Dict[str, np.ndarray]:
         """Add candlestick pattern recognition"""
-        print("  ├─ Candlestick Patterns...")
-
-        patterns = {
-            "DOJI": talib.CDLDOJI,
-            "HAMMER": talib.CDLHAMMER,
-            "INVERTED_HAMMER": talib.CDLINVERTEDHAMMER,
-            "SHOOTING_STAR": talib.CDLSHOOTINGSTAR,
-            "ENGULFING": talib.CDLENGULFING,
-            "HARAMI": talib.CDLHARAMI,
-            "MORNING_STAR": talib.CDLMORNINGSTAR,
-            "EVENING_STAR": talib.CDLEVENINGSTAR,
-            "THREE_WHITE_SOLDIERS": talib.CDL3WHITESOLDIERS,
-            "THREE_BLACK_CROWS": talib.CDL3BLACKCROWS,
-        }
-
-        for name, func in patterns.items():
-            df[f"PATTERN_{name}"] = func(df["open"], df["high"], df["low"], df["close"])
+        self._log.append("  ├─ Candlestick Patterns...")
 
-        return df
+        out = {}
+        patterns = self._pattern_buffer(len(a.close))
+        for i, name in enumerate(self.CANDLESTICK_PATTERNS):
+            out.update(self._add_candlestick_pattern(a, name, patterns[:, i]))
+
+        return out
+
+    def _pattern_buffer(self, n: int) -> np.ndarray:
+        """
+        Allocate one int16 block for all pattern columns
+
+        Pattern outputs are only -100/0/100, so int16 is enough. Column-major
+        order keeps each pattern column contiguous.
+        """
+        shape = (n, len(self.CANDLESTICK_PATTERNS))
+        return np.empty(shape, dtype=np.int16, order="F")
+
+    def _add_candlestick_pattern(
+        self, a: OHLCV, name: str, dest: np.ndarray
+    ) -> Dict[str, np.ndarray]:
+        """Write a single candlestick pattern into its column of the block"""
+        func = self.CANDLESTICK_PATTERNS[name]
+        dest[:] = func(a.open, a.high, a.low, a.close)
+
+        return {f"PATTERN_{name}": dest}
 
     # ========================================================================
     # PRICE ACTION
     # ========================================================================
 
-    def add_price_action(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_price_action(self, a: OHLCV) -> Dict[str, np.ndarray]:
         """Add price action indicators"""
-        print("  ├─ Price Action...")
+        self._log.append("  ├─ Price Action...")
+
+        o, h, l, c = a.open, a.high, a.low, a.close
+        out = {}
+
+        # fmax/fmin skip a NaN open or close like DataFrame.max/min(axis=1)
+        upper_body = np.fmax(o, c)
+        lower_body = np.fmin(o, c)
+        inv_close_pct = self._as_dtype(100.0 / c)
 
         # High-Low Range
-        df["HL_range"] = df["high"] - df["low"]
-        df["HL_range_pct"] = (df["HL_range"] / df["close"]) * 100
+        hl_range = h - l
+        out["HL_range"] = hl_range
+        out["HL_range_pct"] = np.multiply(hl_range, inv_close_pct, dtype=self.dtype)
 
-        # Body size (open-close)
-        df["body_size"] = abs(df["close"] - df["open"])
-        df["body_size_pct"] = (df["body_size"] / df["close"]) * 100
+        # Body size (open-close), absolute value taken in place
+        body_size = np.subtract(c, o)
+        np.abs(body_size, out=body_size)
+        out["body_size"] = body_size
+        out["body_size_pct"] = np.multiply(body_size, inv_close_pct, dtype=self.dtype)
 
-        # Upper/Lower shadows
-        df["upper_shadow"] = df["high"] - df[["open", "close"]].max(axis=1)
-        df["lower_shadow"] = df[["open", "close"]].min(axis=1) - df["low"]
+        # Upper/Lower shadows (branchless, written over the body buffers)
+        out["upper_shadow"] = np.subtract(h, upper_body, out=upper_body)
+        out["lower_shadow"] = np.subtract(lower_body, l, out=lower_body)
 
-        # Bullish/Bearish candle
-        df["is_bullish"] = (df["close"] > df["open"]).astype(int)
+        # Bullish/Bearish candle: reinterpret the 1-byte bool mask as int8
+        out["is_bullish"] = np.greater(c, o).view(np.int8)
 
-        return df
+        return out
 
     # ========================================================================
     # SUPPORT & RESISTANCE
     # ========================================================================
 
     def add_support_resistance(
-        self, df: pd.DataFrame, window: int = 20
-    ) -> pd.DataFrame:
+        self, a: OHLCV, window: int = 20
+    ) -> Dict[str, np.ndarray]:
         """Add support and resistance levels"""
-        print("  ├─ Support & Resistance...")
+        self._log.append("  ├─ Support & Resistance...")
+
+        h, l, c = a.high, a.low, a.close
+        out = {}
 
         # Rolling high/low (resistance/support)
-        df["resistance"] = df["high"].rolling(window=window).max()
-        df["support"] = df["low"].rolling(window=window).min()
+        resistance = rolling_max(h, window)
+        support = rolling_min(l, window)
+        out["resistance"] = resistance
+        out["support"] = support
 
         # Distance to support/resistance
-        df["dist_to_resistance"] = (df["resistance"] - df["close"]) / df["close"] * 100
-        df["dist_to_support"] = (df["close"] - df["support"]) / df["close"] * 100
+        inv_close_pct = self._as_dtype(100.0 / c)
+        out["dist_to_resistance"] = self._as_dtype(resistance - c) * inv_close_pct
+        out["dist_to_support"] = self._as_dtype(c - support) * inv_close_pct
 
-        return df
+        return out
 
     # ========================================================================
     # STATISTICAL INDICATORS
     # ========================================================================
 
-    def add_statistical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_statistical_indicators(self, a: OHLCV) -> Dict[str, np.ndarray]:
         """Add statistical indicators"""
-        print("  ├─ Statistical Indicators...")
+        self._log.append("  ├─ Statistical Indicators...")
 
-        # Returns
-        df["returns"] = df["close"].pct_change()
-        df["log_returns"] = np.log(df["close"] / df["close"].shift(1))
+        c = a.close
+        out = {}
 
-        # Rolling statistics
+        close = pd.Series(c)
+
+        # Returns
+        returns = close.pct_change()
+        out["returns"] = returns.to_numpy()
+
+        # log(c[i] / c[i-1]) as a difference of logs: one log per bar
+        log_close = np.log(c)
+        log_returns = np.empty_like(log_close)
+        log_returns[:1] = np.nan
+        np.subtract(log_close[1:], log_close[:-1], out=log_returns[1:])
+        out["log_returns"] = log_returns
+
+        # Rolling statistics (one pass per window for std/skew/kurt)
+        r = returns.to_numpy()
         for window in [10, 20, 50]:
-            df[f"volatility_{window}"] = df["returns"].rolling(window=window).std()
-            df[f"skew_{window}"] = df["returns"].rolling(window=window).skew()
-            df[f"kurt_{window}"] = df["returns"].rolling(window=window).kurt()
+            _, std, skew, kurt = rolling_moments(r, window)
+            out[f"volatility_{window}"] = std
+            out[f"skew_{window}"] = skew
+            out[f"kurt_{window}"] = kurt
 
-        # Z-score (price deviation from mean)
-        df["zscore_20"] = (df["close"] - df["close"].rolling(20).mean()) / df[
-            "close"
-        ].rolling(20).std()
+        # Z-score (price deviation from mean). Uses the rolling kernel rather
+        # than the Bollinger Bands: TA-Lib blanks every bar after a NaN close,
+        # while a rolling window only blanks the windows that contain it
+        mean_20, std_20, _, _ = rolling_moments(c, 20)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out["zscore_20"] = (c - mean_20) / std_20
 
-        return df
+        return out
 
     # ========================================================================
     # MAIN FUNCTION
@@ -456,46 +712,73 @@ class TechnicalIndicators:
         if not self.validate_data(df):
             return df
 
-        # Make a copy
-        df = df.copy()
-
-        # Add all indicator groups
-        try:
+        # Shallow copy only: indicator columns are attached with concat/assign,
+        # which build a new frame, and the OHLCV arrays are never written to,
+        # so the caller's data is not mutated
+        df = df.copy(deep=False)
+
+        # Convert OHLCV to contiguous float64 arrays once; every indicator
+        # returns a dict of ndarrays, merged into `out` and attached in one go
+        arrays = self._prepare_arrays(df)
+        out = {}
+        self._log = []
+        self._cache.clear()
+
+        # Independent indicator groups, in output column order; each
+        # candlestick pattern is its own task writing one column of `patterns`
+        patterns = self._pattern_buffer(len(df))
+        tasks = [
             # Trend
-            df = self.add_moving_averages(df)
-            df = self.add_macd(df)
-            df = self.add_adx(df)
-            df = self.add_parabolic_sar(df)
-
+            (self.add_moving_averages,),
+            (self.add_macd,),
+            (self.add_adx,),
+            (self.add_parabolic_sar,),
             # Momentum
-            df = self.add_rsi(df)
-            df = self.add_stochastic(df)
-            df = self.add_williams_r(df)
-            df = self.add_roc(df)
-            df = self.add_momentum(df)
-            df = self.add_cci(df)
-
+            (self.add_rsi,),
+            (self.add_stochastic,),
+            (self.add_williams_r,),
+            (self.add_roc,),
+            (self.add_momentum,),
+            (self.add_cci,),
             # Volatility
-            df = self.add_bollinger_bands(df)
-            df = self.add_atr(df)
-            df = self.add_keltner_channels(df)
-            df = self.add_donchian_channels(df)
-
+            (self.add_bollinger_bands,),
+            (self.add_atr,),
+            (self.add_keltner_channels,),
+            (self.add_donchian_channels,),
             # Volume
-            df = self.add_volume_indicators(df)
-            df = self.add_obv(df)
-            df = self.add_mfi(df)
-            df = self.add_vwap(df)
-
+            (self.add_volume_indicators,),
+            (self.add_obv,),
+            (self.add_mfi,),
+            (self.add_vwap,),
             # Patterns
-            df = self.add_candlestick_patterns(df)
-
+            *(
+                (self._add_candlestick_pattern, name, patterns[:, i])
+                for i, name in enumerate(self.CANDLESTICK_PATTERNS)
+            ),
             # Price Action
-            df = self.add_price_action(df)
-            df = self.add_support_resistance(df)
-
+            (self.add_price_action,),
+            (self.add_support_resistance,),
             # Statistical
-            df = self.add_statistical_indicators(df)
+            (self.add_statistical_indicators,),
+        ]
+
+        # Add all indicator groups
+        try:
+            # Pattern tasks are submitted one by one and don't log
+            self._log.append("  ├─ Candlestick Patterns...")
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # Results are merged in task order so the column layout
+                # doesn't depend on scheduling
+                futures = [
+                    executor.submit(func, arrays, *args) for func, *args in tasks
+                ]
+                for future in futures:
+                    out.update(future.result())
+
+            self._flush_log()
+
+            df = self._attach(df, out)
 
             print("  └─ [OK] All indicators added!")
 
@@ -510,13 +793,53 @@ class TechnicalIndicators:
             print(f"\n[Chart] Total features created: {len(feature_cols)}")
 
         except Exception as e:
+            self._flush_log()
             print(f"\n[Error] Error adding indicators: {e}")
             import traceback
 
             traceback.print_exc()
 
+            # Keep the indicators computed before the failure
+            df = self._attach(df, out)
+
         return df
 
+    @staticmethod
+    def _attach(df: pd.DataFrame, out: Dict[str, np.ndarray]) -> pd.DataFrame:
+        """
+        Attach indicator arrays to df with a single concat
+
+        Args:
+            df: Input DataFrame
+            out: Column name -> array, in output column order
+
+        Returns:
+            DataFrame with the indicator columns appended
+        """
+        if not out:
+            return df
+
+        # Recomputing on a frame that already has indicators: overwrite the
+        # existing columns in place, as column assignment would
+        if df.columns.isin(list(out)).any():
+            return df.assign(**out)
+
+        # Consecutive columns of the same dtype go into one preallocated
+        # column-major matrix, which pandas wraps as a single block without
+        # copying; the runs are concatenated in order, preserving the layout
+        blocks = []
+        for dtype, run in groupby(out.items(), key=lambda item: item[1].dtype):
+            run = list(run)
+            matrix = np.empty((len(df), len(run)), dtype=dtype, order="F")
+            for j, (_, values) in enumerate(run):
+                matrix[:, j] = values
+            names = [name for name, _ in run]
+            blocks.append(
+                pd.DataFrame(matrix, columns=names, index=df.index, copy=False)
+            )
+
+        return pd.concat([df, *blocks], axis=1, copy=False)
+
     def get_feature_groups(self, df: pd.DataFrame) -> dict:
         """
         Get features organized by category
@@ -524,50 +847,13 @@ class TechnicalIndicators:
         Returns:
             dict: Feature names organized by category
         """
-        features = {
-            "trend": [
-                col
-                for col in df.columns
-                if any(x in col for x in ["SMA", "EMA", "WMA", "MACD", "ADX", "SAR"])
-            ],
-            "momentum": [
-                col
-                for col in df.columns
-                if any(x in col for x in ["RSI", "STOCH", "WILLR", "ROC", "MOM", "CCI"])
-            ],
-            "volatility": [
-                col
-                for col in df.columns
-                if any(x in col for x in ["BB_", "ATR", "KELT", "DONCH", "volatility"])
-            ],
-            "volume": [
-                col
-                for col in df.columns
-                if any(x in col for x in ["VOL_", "OBV", "MFI", "VWAP"])
-            ],
-            "patterns": [col for col in df.columns if "PATTERN_" in col],
-            "price_action": [
-                col
-                for col in df.columns
-                if any(
-                    x in col
-                    for x in [
-                        "HL_range",
-                        "body_size",
-                        "shadow",
-                        "is_bullish",
-                        "resistance",
-                        "support",
-                        "dist_to",
-                    ]
-                )
-            ],
-            "statistical": [
-                col
-                for col in df.columns
-                if any(x in col for x in ["returns", "skew", "kurt", "zscore"])
-            ],
-        }
+        features = {group: [] for group in self.FEATURE_GROUP_PATTERNS}
+
+        # One pass over the columns; a column can belong to several groups
+        for col in df.columns:
+            for group, pattern in self.FEATURE_GROUP_PATTERNS.items():
+                if pattern.search(col):
+                    features[group].append(col)
 
         return features
 
@@ -19,19 +19,81 @@ Usage:
 
 import pandas as pd
 import numpy as np
+from collections import OrderedDict
 from datetime import datetime
-from typing import Optional
+from itertools import groupby
+from typing import Dict, List, Optional, Tuple
+import logging
 import warnings
 
+from ._njit import NUMBA_AVAILABLE
+from ._time_njit import (
+    TIME_FEATURE_COLUMNS,
+    TIME_FEATURE_DTYPES,
+    time_features,
+    time_features_batch,
+)
+
+logger = logging.getLogger(__name__)
+
 warnings.filterwarnings("ignore")
 
 
 class TimeFeatures:
     """Extracts time-based features from timestamp"""
 
-    def __init__(self):
-        """Initialize Time Features extractor"""
+    # Days per month in a non-leap year (January first)
+    DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], np.int8)
+
+    # 0/1 indicator columns that can be packed into time_flags_u64, in bit
+    # order (bit k = FLAG_COLUMNS[k])
+    FLAG_COLUMNS = [
+        "is_weekend",
+        "is_monday",
+        "is_friday",
+        "is_month_start",
+        "is_month_end",
+        "is_quarter_start",
+        "is_quarter_end",
+        "session_sydney",
+        "session_tokyo",
+        "session_london",
+        "session_newyork",
+        "overlap_london_newyork",
+        "overlap_tokyo_london",
+        "is_liquid_hours",
+        "is_low_liquidity",
+        "is_peak_hours",
+        "is_first_hour_london",
+        "is_last_hour_ny",
+        "is_first_day_of_week",
+        "is_last_day_of_week",
+        "is_first_5_days",
+        "is_last_5_days",
+    ]
+    PACKED_FLAGS_COLUMN = "time_flags_u64"
+
+    def __init__(
+        self,
+        pack_flags: bool = False,
+        cache_size: int = 8,
+        cache_max_bytes: int = 32 * 2**20,
+    ):
+        """
+        Initialize Time Features extractor
+
+        Args:
+            pack_flags: Store the 0/1 indicators (FLAG_COLUMNS) as bits of a
+                        single uint64 column "time_flags_u64" instead of one
+                        int8 column each; read them back with unpack_flag()
+            cache_size: Number of fused feature blocks kept for re-runs on the
+                        same (or a one-bar-shifted) window; 0 disables it
+            cache_max_bytes: Total size of the cached blocks and their
+                             timestamps; larger windows are never cached
+        """
         self.required_columns = ["timestamp"]
+        self.pack_flags = pack_flags
+        self.flag_bits = {name: bit for bit, name in enumerate(self.FLAG_COLUMNS)}
 
         # Define trading sessions (UTC time)
         self.sessions = {
@@ -47,6 +109,58 @@ class TimeFeatures:
             "tokyo_london": (8, 9),  # 08:00 - 09:00 UTC
         }
 
+        # Every hour-of-day flag as a [start, end) UTC range (wrapping
+        # past midnight when start > end)
+        self.hour_flags = {
+            **{f"session_{name}": hours for name, hours in self.sessions.items()},
+            **{f"overlap_{name}": hours for name, hours in self.overlaps.items()},
+            "is_liquid_hours": (8, 22),
+            "is_low_liquidity": (22, 8),
+            "is_peak_hours": (13, 16),
+            "is_first_hour_london": (8, 9),
+            "is_last_hour_ny": (21, 22),
+        }
+
+        # 24-entry lookup table: bit k of hour_lut[h] is flag k at hour h
+        self.hour_flag_bits = {name: bit for bit, name in enumerate(self.hour_flags)}
+        self.hour_lut = np.zeros(24, dtype=np.uint16)
+        for name, (start, end) in self.hour_flags.items():
+            for h in range(24):
+                in_range = start <= h < end if start < end else h >= start or h < end
+                if in_range:
+                    self.hour_lut[h] |= 1 << self.hour_flag_bits[name]
+
+        # sin/cos lookup tables for the cyclical encodings, indexed by the
+        # component value: (name, period, table size)
+        self.cyclical_luts = {}
+        for name, period, size in [
+            ("hour", 24, 24),
+            ("day", 7, 7),
+            ("dom", 30, 32),  # day of month 1-31 on an approximate 30-day cycle
+            ("month", 12, 13),  # month 1-12
+        ]:
+            angle = 2 * np.pi * np.arange(size) / period
+            self.cyclical_luts[name] = (
+                np.sin(angle).astype(np.float32),
+                np.cos(angle).astype(np.float32),
+            )
+
+        # days_in_month result for the last index seen: (dti, days)
+        self._days_in_month_cache = None
+
+        # LRU of fused blocks: (first_ts, last_ts, len) -> (ts_ns, block),
+        # bounded by entry count and by total bytes
+        self.cache_size = cache_size
+        self.cache_max_bytes = cache_max_bytes
+        self._block_cache: "OrderedDict[Tuple[int, int, int], Tuple]" = OrderedDict()
+        self._cache_bytes = 0
+
+        # Names of the columns written by the add_* methods, in order
+        self._added_features: List[str] = []
+
+        # Print progress banners (set per call by add_all_time_features)
+        self.verbose = False
+
     def validate_data(self, df: pd.DataFrame) -> bool:
         """
         Validate that DataFrame has required columns
@@ -63,17 +177,258 @@ class TimeFeatures:
 
         return True
 
+    def _status(self, message: str):
+        """Print a progress line if verbose, otherwise send it to logger.debug"""
+        if self.verbose:
+            print(message)
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug(message)
+
     def ensure_datetime(self, df: pd.DataFrame) -> pd.DataFrame:
         """Convert timestamp to datetime if needed"""
         if not pd.api.types.is_datetime64_any_dtype(df["timestamp"]):
             df["timestamp"] = pd.to_datetime(df["timestamp"])
         return df
 
+    def get_datetime_index(
+        self, df: pd.DataFrame, dti: Optional[pd.DatetimeIndex] = None
+    ) -> pd.DatetimeIndex:
+        """
+        Return the timestamps as a DatetimeIndex
+
+        Every dt component (hour, day, month, ...) read from the index comes
+        back as a plain array, so add_all_time_features builds it once and
+        passes it to each feature group.
+
+        Args:
+            df: DataFrame with datetime timestamp column
+            dti: Already-built index to reuse (returned as is)
+
+        Returns:
+            pd.DatetimeIndex: Timestamps, one per row
+        """
+        if dti is None:
+            dti = pd.DatetimeIndex(df["timestamp"])
+        return dti
+
+    @staticmethod
+    def time_components(
+        dti: pd.DatetimeIndex, ctx: Optional[Dict[str, np.ndarray]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calendar components shared by the feature groups
+
+        add_all_time_features extracts them once and passes the same dict
+        to every group, so no component is read from dti twice.
+
+        Args:
+            dti: Timestamps
+            ctx: Already-built components to reuse (returned as is)
+
+        Returns:
+            dict: int8 arrays "hour", "dow" (Monday=0), "day", "month"
+                  (float32 with NaN for NaT rows if dti has any)
+        """
+        if ctx is None:
+            dtype = np.float32 if dti.hasnans else np.int8
+            ctx = {
+                "hour": dti.hour.to_numpy().astype(dtype),
+                "dow": dti.dayofweek.to_numpy().astype(dtype),
+                "day": dti.day.to_numpy().astype(dtype),
+                "month": dti.month.to_numpy().astype(dtype),
+            }
+        return ctx
+
+    @staticmethod
+    def as_int(values: np.ndarray, dtype) -> np.ndarray:
+        """values cast to dtype, or float32 if they hold NaN (NaT rows)"""
+        if values.dtype.kind == "f" and np.isnan(values).any():
+            return values.astype(np.float32)
+        return values.astype(dtype)
+
+    @staticmethod
+    def take(table: np.ndarray, values: np.ndarray, fill) -> np.ndarray:
+        """table[values], with fill for NaN values (NaT rows)"""
+        if values.dtype.kind != "f":
+            return table[values]
+        missing = np.isnan(values)
+        out = table[np.where(missing, 0, values).astype(np.intp)]
+        out[missing] = fill
+        return out
+
+    @staticmethod
+    def wall_clock_ns(dti: pd.DatetimeIndex) -> np.ndarray:
+        """Wall-clock timestamps as int64 nanoseconds since the epoch"""
+        if dti.tz is not None:
+            dti = dti.tz_localize(None)
+        return dti.as_unit("ns").asi8
+
+    def add_columns(
+        self, df: pd.DataFrame, columns: Dict[str, np.ndarray]
+    ) -> pd.DataFrame:
+        """
+        Attach new feature columns with a single concat
+
+        Consecutive columns of the same dtype are packed into one
+        preallocated column-major block, so pandas adds one block per run
+        instead of one per column.
+
+        Args:
+            df: Input DataFrame
+            columns: Column name -> array, in output column order
+
+        Returns:
+            DataFrame with the columns appended
+        """
+        if self.pack_flags:
+            columns = self._pack_flag_columns(df, columns)
+
+        self._added_features.extend(
+            name for name in columns if name not in self._added_features
+        )
+
+        if df.columns.isin(list(columns)).any():
+            # Recomputing existing features: overwrite them in place
+            return df.assign(**columns)
+
+        blocks = []
+        for dtype, run in groupby(columns.items(), key=lambda item: item[1].dtype):
+            run = list(run)
+            block = np.empty((len(df), len(run)), dtype=dtype, order="F")
+            for j, (_, values) in enumerate(run):
+                block[:, j] = values
+            names = [name for name, _ in run]
+            blocks.append(
+                pd.DataFrame(block, columns=names, index=df.index, copy=False)
+            )
+
+        return pd.concat([df, *blocks], axis=1, copy=False)
+
+    def days_in_month(self, dti: pd.DatetimeIndex) -> np.ndarray:
+        """
+        Days in each row's month, from a 12-entry table plus leap years
+
+        The result is kept for the last index seen, so the time-since and
+        special-period groups share one computation.
+
+        Args:
+            dti: Timestamps
+
+        Returns:
+            np.ndarray: int8 days in month (28-31), float32 with NaN for NaT
+        """
+        cache = self._days_in_month_cache
+        if cache is not None and cache[0] is dti:
+            return cache[1]
+
+        year = dti.year.to_numpy()
+        month = dti.month.to_numpy()
+        leap = ((year % 4 == 0) & (year % 100 != 0)) | (year % 400 == 0)
+        table = self.DAYS_IN_MONTH
+        if dti.hasnans:
+            table = table.astype(np.float32)
+        days = self.take(table, month - 1, np.nan)
+        days = days + ((month == 2) & leap).astype(np.int8)
+
+        self._days_in_month_cache = (dti, days)
+        return days
+
+    def _pack_flag_columns(
+        self, df: pd.DataFrame, columns: Dict[str, np.ndarray]
+    ) -> Dict[str, np.ndarray]:
+        """OR the flag columns into the packed column and drop them"""
+        flags = [name for name in columns if name in self.flag_bits]
+        if not flags:
+            return columns
+
+        packed = np.zeros(len(df), dtype=np.uint64)
+        for name in flags:
+            packed |= columns[name].astype(np.uint64) << np.uint64(self.flag_bits[name])
+
+        # Groups add their flags one after another; merge with earlier bits
+        if self.PACKED_FLAGS_COLUMN in df.columns:
+            packed |= df[self.PACKED_FLAGS_COLUMN].to_numpy(dtype=np.uint64)
+
+        columns = {k: v for k, v in columns.items() if k not in self.flag_bits}
+        columns[self.PACKED_FLAGS_COLUMN] = packed
+        return columns
+
+    def unpack_flag(self, df: pd.DataFrame, name: str) -> np.ndarray:
+        """
+        Read one 0/1 indicator, whether stored packed or as its own column
+
+        Args:
+            df: DataFrame with time features
+            name: Flag name (one of FLAG_COLUMNS)
+
+        Returns:
+            np.ndarray: int8 flag values
+        """
+        if name in df.columns:
+            return df[name].to_numpy(dtype=np.int8)
+
+        packed = df[self.PACKED_FLAGS_COLUMN].to_numpy(dtype=np.uint64)
+        bit = np.uint64(self.flag_bits[name])
+        return ((packed >> bit) & np.uint64(1)).astype(np.int8)
+
+    @staticmethod
+    def iso_week(dti: pd.DatetimeIndex) -> np.ndarray:
+        """
+        ISO 8601 week number computed from day ordinals
+
+        The ISO week is the one containing that week's Thursday, numbered
+        from the first Thursday of the Thursday's year.
+
+        Args:
+            dti: Timestamps (tz-aware ones use their local wall time)
+
+        Returns:
+            np.ndarray: int8 week of year (1-53), float32 with NaN for NaT
+        """
+        if dti.tz is not None:
+            dti = dti.tz_localize(None)
+
+        days = dti.to_numpy().astype("datetime64[D]")
+        ordinal = days.astype(np.int64)
+
+        # 1970-01-01 was a Thursday; weekday with Monday=0
+        weekday = (ordinal + 3) % 7
+        thursday = days - weekday + 3
+        year_start = thursday.astype("datetime64[Y]").astype("datetime64[D]")
+        day_of_year = thursday - year_start
+
+        week = (day_of_year.astype(np.int64) // 7 + 1).astype(np.int8)
+        if not dti.hasnans:
+            return week
+        return np.where(np.isnat(days), np.nan, week).astype(np.float32)
+
+    def hour_flag_columns(self, hour: np.ndarray, names: list) -> Dict[str, np.ndarray]:
+        """
+        Extract hour-of-day flags via the packed lookup table
+
+        Args:
+            hour: Hour of day (0-23) per row
+            names: Flag names (keys of self.hour_flags)
+
+        Returns:
+            dict: Flag name -> int8 array (1 inside the range, else 0)
+        """
+        packed = self.take(self.hour_lut, hour, 0)
+        return {
+            name: ((packed >> self.hour_flag_bits[name]) & 1).astype(np.int8)
+            for name in names
+        }
+
     # ========================================================================
     # BASIC TIME FEATURES
     # ========================================================================
 
-    def add_basic_time_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_basic_time_features(
+        self,
+        df: pd.DataFrame,
+        dti: Optional[pd.DatetimeIndex] = None,
+        ctx: Optional[Dict[str, np.ndarray]] = None,
+    ) -> pd.DataFrame:
         """
         Add basic time features
 
@@ -81,37 +436,47 @@ class TimeFeatures:
         - hour, day_of_week, day_of_month, month, quarter, year
         - is_weekend, is_month_start, is_month_end, is_quarter_start, is_quarter_end
         """
-        print("  ├─ Basic Time Features...")
+        self._status("  ├─ Basic Time Features...")
 
         df = self.ensure_datetime(df)
+        dti = self.get_datetime_index(df, dti)
 
-        # Extract components
-        df["hour"] = df["timestamp"].dt.hour
-        df["day_of_week"] = df["timestamp"].dt.dayofweek  # Monday=0, Sunday=6
-        df["day_of_month"] = df["timestamp"].dt.day
-        df["week_of_year"] = df["timestamp"].dt.isocalendar().week
-        df["month"] = df["timestamp"].dt.month
-        df["quarter"] = df["timestamp"].dt.quarter
-        df["year"] = df["timestamp"].dt.year
+        # Extract components (all fit in int8 except the year)
+        ctx = self.time_components(dti, ctx)
+        day_of_week = ctx["dow"]  # Monday=0, Sunday=6
+        out = {}
+
+        out["hour"] = ctx["hour"]
+        out["day_of_week"] = day_of_week
+        out["day_of_month"] = ctx["day"]
+        out["week_of_year"] = self.iso_week(dti)
+        out["month"] = ctx["month"]
+        out["quarter"] = self.as_int((ctx["month"] - 1) // 3 + 1, np.int8)
+        out["year"] = self.as_int(dti.year.to_numpy(), np.int16)
 
         # Boolean indicators
-        df["is_weekend"] = (df["day_of_week"] >= 5).astype(int)  # Saturday=5, Sunday=6
-        df["is_monday"] = (df["day_of_week"] == 0).astype(int)
-        df["is_friday"] = (df["day_of_week"] == 4).astype(int)
+        out["is_weekend"] = (day_of_week >= 5).astype(np.int8)  # Saturday=5, Sunday=6
+        out["is_monday"] = (day_of_week == 0).astype(np.int8)
+        out["is_friday"] = (day_of_week == 4).astype(np.int8)
 
         # Month/Quarter boundaries
-        df["is_month_start"] = df["timestamp"].dt.is_month_start.astype(int)
-        df["is_month_end"] = df["timestamp"].dt.is_month_end.astype(int)
-        df["is_quarter_start"] = df["timestamp"].dt.is_quarter_start.astype(int)
-        df["is_quarter_end"] = df["timestamp"].dt.is_quarter_end.astype(int)
+        out["is_month_start"] = dti.is_month_start.astype(np.int8)
+        out["is_month_end"] = dti.is_month_end.astype(np.int8)
+        out["is_quarter_start"] = dti.is_quarter_start.astype(np.int8)
+        out["is_quarter_end"] = dti.is_quarter_end.astype(np.int8)
 
-        return df
+        return self.add_columns(df, out)
 
     # ========================================================================
     # TRADING SESSIONS
     # ========================================================================
 
-    def add_trading_sessions(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_trading_sessions(
+        self,
+        df: pd.DataFrame,
+        dti: Optional[pd.DatetimeIndex] = None,
+        ctx: Optional[Dict[str, np.ndarray]] = None,
+    ) -> pd.DataFrame:
         """
         Add trading session indicators
 
@@ -121,52 +486,45 @@ class TimeFeatures:
         - London/European: 08:00 - 16:00
         - New York/US: 13:00 - 22:00
         """
-        print("  ├─ Trading Sessions...")
+        self._status("  ├─ Trading Sessions...")
 
         df = self.ensure_datetime(df)
-
-        if "hour" not in df.columns:
-            df["hour"] = df["timestamp"].dt.hour
-
-        # Sydney session
-        df["session_sydney"] = ((df["hour"] >= 21) | (df["hour"] < 6)).astype(int)
-
-        # Tokyo/Asian session
-        df["session_tokyo"] = ((df["hour"] >= 0) & (df["hour"] < 9)).astype(int)
-
-        # London/European session
-        df["session_london"] = ((df["hour"] >= 8) & (df["hour"] < 16)).astype(int)
-
-        # New York/US session
-        df["session_newyork"] = ((df["hour"] >= 13) & (df["hour"] < 22)).astype(int)
-
-        # Market overlaps (high liquidity periods)
-        df["overlap_london_newyork"] = ((df["hour"] >= 13) & (df["hour"] < 16)).astype(
-            int
+        hour = self.time_components(self.get_datetime_index(df, dti), ctx)["hour"]
+
+        # Sessions (Sydney, Tokyo/Asian, London/European, New York/US) and
+        # market overlaps (high liquidity periods)
+        out = self.hour_flag_columns(
+            hour,
+            [
+                "session_sydney",
+                "session_tokyo",
+                "session_london",
+                "session_newyork",
+                "overlap_london_newyork",
+                "overlap_tokyo_london",
+            ],
         )
 
-        df["overlap_tokyo_london"] = ((df["hour"] >= 8) & (df["hour"] < 9)).astype(int)
-
-        # Categorize main session
-        def get_main_session(hour):
-            if 0 <= hour < 8:
-                return 1  # Asian
-            elif 8 <= hour < 13:
-                return 2  # European
-            elif 13 <= hour < 22:
-                return 3  # US
-            else:
-                return 4  # After-hours
-
-        df["main_session"] = df["hour"].apply(get_main_session)
+        # Categorize main session:
+        # 1 = Asian (00-08), 2 = European (08-13), 3 = US (13-22),
+        # 4 = After-hours (22-24)
+        session_bins = np.array([0, 8, 13, 22], dtype=np.int8)
+        out["main_session"] = np.searchsorted(session_bins, hour, side="right").astype(
+            np.int8
+        )
 
-        return df
+        return self.add_columns(df, out)
 
     # ========================================================================
     # MARKET HOURS
     # ========================================================================
 
-    def add_market_hours(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_market_hours(
+        self,
+        df: pd.DataFrame,
+        dti: Optional[pd.DatetimeIndex] = None,
+        ctx: Optional[Dict[str, np.ndarray]] = None,
+    ) -> pd.DataFrame:
         """
         Add market hours indicators
 
@@ -175,83 +533,74 @@ class TimeFeatures:
         - Pre-market, regular hours, after-hours
         - Time until/since major events
         """
-        print("  ├─ Market Hours...")
+        self._status("  ├─ Market Hours...")
 
         df = self.ensure_datetime(df)
+        hour = self.time_components(self.get_datetime_index(df, dti), ctx)["hour"]
 
-        if "hour" not in df.columns:
-            df["hour"] = df["timestamp"].dt.hour
-
-        # Trading hours activity
-        df["is_liquid_hours"] = ((df["hour"] >= 8) & (df["hour"] < 22)).astype(int)
-
-        df["is_low_liquidity"] = ((df["hour"] >= 22) | (df["hour"] < 8)).astype(int)
-
-        # Peak trading hours (London-NY overlap)
-        df["is_peak_hours"] = ((df["hour"] >= 13) & (df["hour"] < 16)).astype(int)
+        # Trading hours activity and peak trading hours (London-NY overlap)
+        out = self.hour_flag_columns(
+            hour, ["is_liquid_hours", "is_low_liquidity", "is_peak_hours"]
+        )
 
         # Market open/close proximity
         # London open: 08:00
-        df["hours_since_london_open"] = df["hour"].apply(
-            lambda h: h - 8 if h >= 8 else h + 16
-        )
+        hours_since_london_open = np.where(hour >= 8, hour - 8, hour + 16)
+        out["hours_since_london_open"] = self.as_int(hours_since_london_open, np.int8)
 
         # NY open: 13:00
-        df["hours_since_ny_open"] = df["hour"].apply(
-            lambda h: h - 13 if h >= 13 else h + 11
-        )
+        hours_since_ny_open = np.where(hour >= 13, hour - 13, hour + 11)
+        out["hours_since_ny_open"] = self.as_int(hours_since_ny_open, np.int8)
 
-        return df
+        return self.add_columns(df, out)
 
     # ========================================================================
     # CYCLICAL ENCODING
     # ========================================================================
 
-    def add_cyclical_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_cyclical_features(
+        self,
+        df: pd.DataFrame,
+        dti: Optional[pd.DatetimeIndex] = None,
+        ctx: Optional[Dict[str, np.ndarray]] = None,
+    ) -> pd.DataFrame:
         """
         Add cyclical encoding using sine/cosine transformations
 
         This preserves the cyclical nature of time (e.g., hour 23 is close to hour 0)
         """
-        print("  ├─ Cyclical Encoding...")
+        self._status("  ├─ Cyclical Encoding...")
 
         df = self.ensure_datetime(df)
+        dti = self.get_datetime_index(df, dti)
+
+        # Hour (24h), day of week (7d), day of month (30d - approximate) and
+        # month (12m) cycles; each value is a gather from a float32 table
+        ctx = self.time_components(dti, ctx)
+        components = {
+            "hour": ctx["hour"],
+            "day": ctx["dow"],
+            "dom": ctx["day"],
+            "month": ctx["month"],
+        }
+        out = {}
+        for name, values in components.items():
+            sin_lut, cos_lut = self.cyclical_luts[name]
+            out[f"{name}_sin"] = self.take(sin_lut, values, np.nan)
+            out[f"{name}_cos"] = self.take(cos_lut, values, np.nan)
 
-        # Hour (24-hour cycle)
-        if "hour" not in df.columns:
-            df["hour"] = df["timestamp"].dt.hour
-
-        df["hour_sin"] = np.sin(2 * np.pi * df["hour"] / 24)
-        df["hour_cos"] = np.cos(2 * np.pi * df["hour"] / 24)
-
-        # Day of week (7-day cycle)
-        if "day_of_week" not in df.columns:
-            df["day_of_week"] = df["timestamp"].dt.dayofweek
-
-        df["day_sin"] = np.sin(2 * np.pi * df["day_of_week"] / 7)
-        df["day_cos"] = np.cos(2 * np.pi * df["day_of_week"] / 7)
-
-        # Day of month (30-day cycle - approximate)
-        if "day_of_month" not in df.columns:
-            df["day_of_month"] = df["timestamp"].dt.day
-
-        df["dom_sin"] = np.sin(2 * np.pi * df["day_of_month"] / 30)
-        df["dom_cos"] = np.cos(2 * np.pi * df["day_of_month"] / 30)
-
-        # Month (12-month cycle)
-        if "month" not in df.columns:
-            df["month"] = df["timestamp"].dt.month
-
-        df["month_sin"] = np.sin(2 * np.pi * df["month"] / 12)
-        df["month_cos"] = np.cos(2 * np.pi * df["month"] / 12)
-
-        return df
+        return self.add_columns(df, out)
 
     # ========================================================================
     # TIME SINCE EVENTS
     # ========================================================================
 
-    def add_time_since_events(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_time_since_events(
+        self,
+        df: pd.DataFrame,
+        dti: Optional[pd.DatetimeIndex] = None,
+        ctx: Optional[Dict[str, np.ndarray]] = None,
+    ) -> pd.DataFrame:
         """
         Add time since specific events
 
@@ -260,33 +609,46 @@ class TimeFeatures:
         - Time to next session
         - Time since weekend
         """
-        print("  ├─ Time Since Events...")
+        self._status("  ├─ Time Since Events...")
 
         df = self.ensure_datetime(df)
-
-        # Minutes since midnight (start of day)
-        df["minutes_since_midnight"] = (
-            df["timestamp"].dt.hour * 60 + df["timestamp"].dt.minute
-        )
-
-        # Normalize to 0-1
-        df["time_of_day_normalized"] = df["minutes_since_midnight"] / (24 * 60)
+        dti = self.get_datetime_index(df, dti)
+        day = self.time_components(dti, ctx)["day"]
+        out = {}
+
+        # Minutes since midnight (start of day), straight from the ns values
+        minutes_since_midnight = (
+            (self.wall_clock_ns(dti) // 60_000_000_000) % 1440
+        ).astype(np.int16)
+        if dti.hasnans:
+            minutes_since_midnight = np.where(
+                dti.isna(), np.nan, minutes_since_midnight
+            ).astype(np.float32)
+        out["minutes_since_midnight"] = minutes_since_midnight
+
+        # Normalize to 0-1 (float32 is plenty for a 1/1440 step)
+        out["time_of_day_normalized"] = minutes_since_midnight.astype(
+            np.float32
+        ) / np.float32(24 * 60)
 
         # Days since start of month
-        df["days_since_month_start"] = df["timestamp"].dt.day - 1
+        out["days_since_month_start"] = self.as_int(day - 1, np.int8)
 
         # Days until end of month
-        df["days_to_month_end"] = (
-            df["timestamp"].dt.days_in_month - df["timestamp"].dt.day
-        )
+        out["days_to_month_end"] = self.as_int(self.days_in_month(dti) - day, np.int8)
 
-        return df
+        return self.add_columns(df, out)
 
     # ========================================================================
     # SPECIAL PERIODS
     # ========================================================================
 
-    def add_special_periods(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_special_periods(
+        self,
+        df: pd.DataFrame,
+        dti: Optional[pd.DatetimeIndex] = None,
+        ctx: Optional[Dict[str, np.ndarray]] = None,
+    ) -> pd.DataFrame:
         """
         Add indicators for special trading periods
 
@@ -295,122 +657,267 @@ class TimeFeatures:
         - First/Last day of week/month
         - Holiday proximity (simplified)
         """
-        print("  ├─ Special Periods...")
+        self._status("  ├─ Special Periods...")
 
         df = self.ensure_datetime(df)
+        dti = self.get_datetime_index(df, dti)
 
-        if "hour" not in df.columns:
-            df["hour"] = df["timestamp"].dt.hour
-        if "day_of_week" not in df.columns:
-            df["day_of_week"] = df["timestamp"].dt.dayofweek
-        if "day_of_month" not in df.columns:
-            df["day_of_month"] = df["timestamp"].dt.day
+        ctx = self.time_components(dti, ctx)
+        hour = ctx["hour"]
+        day_of_week = ctx["dow"]
+        day_of_month = ctx["day"]
 
         # First/Last hour of active trading
-        df["is_first_hour_london"] = (df["hour"] == 8).astype(int)
-        df["is_last_hour_ny"] = (df["hour"] == 21).astype(int)
+        out = self.hour_flag_columns(hour, ["is_first_hour_london", "is_last_hour_ny"])
 
         # First/Last day of week
-        df["is_first_day_of_week"] = (df["day_of_week"] == 0).astype(int)
-        df["is_last_day_of_week"] = (df["day_of_week"] == 4).astype(int)
+        out["is_first_day_of_week"] = (day_of_week == 0).astype(np.int8)
+        out["is_last_day_of_week"] = (day_of_week == 4).astype(np.int8)
 
         # First/Last 5 days of month
-        df["is_first_5_days"] = (df["day_of_month"] <= 5).astype(int)
-        df["is_last_5_days"] = (
-            df["day_of_month"] >= (df["timestamp"].dt.days_in_month - 5)
-        ).astype(int)
+        out["is_first_5_days"] = (day_of_month <= 5).astype(np.int8)
+        out["is_last_5_days"] = (day_of_month >= self.days_in_month(dti) - 5).astype(
+            np.int8
+        )
 
         # Week number in month (1-5)
-        df["week_of_month"] = ((df["day_of_month"] - 1) // 7) + 1
+        out["week_of_month"] = self.as_int((day_of_month - 1) // 7 + 1, np.int8)
 
-        return df
+        return self.add_columns(df, out)
+
+    # ========================================================================
+    # FUSED KERNEL
+    # ========================================================================
+
+    def add_fused_time_features(
+        self, df: pd.DataFrame, dti: Optional[pd.DatetimeIndex] = None
+    ) -> pd.DataFrame:
+        """
+        Add every time feature in one compiled pass over the timestamps
+
+        Produces the same columns, order and dtypes as running all the
+        add_* groups above (timestamps are taken as wall-clock time). With
+        NaT timestamps, the columns that hold NaN stay float32.
+        """
+        self._status("  ├─ All Time Features (fused kernel)...")
+
+        df = self.ensure_datetime(df)
+        dti = self.get_datetime_index(df, dti)
+
+        block = self.time_feature_block(self.wall_clock_ns(dti))
+        out = {}
+        for j, name in enumerate(TIME_FEATURE_COLUMNS):
+            values = block[:, j]
+            dtype = TIME_FEATURE_DTYPES.get(name, np.int8)
+            # NaT rows leave NaN in the calendar columns: keep those float32
+            # instead of casting NaN to a fake midnight-Monday integer
+            if dti.hasnans and np.isnan(values).any():
+                dtype = np.float32
+            out[name] = values.astype(dtype)
+
+        return self.add_columns(df, out)
+
+    def time_feature_block(self, ts: np.ndarray) -> np.ndarray:
+        """
+        Fused (n, F) float32 feature block for int64 ns timestamps, memoized
+
+        An identical window is served from the cache. A window that starts
+        inside the most recent cached one (e.g. the same bars shifted by one)
+        reuses the overlapping rows and only computes the new bars.
+
+        Args:
+            ts: int64 wall-clock ns timestamps
+
+        Returns:
+            np.ndarray: Block in TIME_FEATURE_COLUMNS order (do not modify)
+        """
+        if self.cache_size <= 0 or len(ts) == 0:
+            return time_features(ts, *self.kernel_tables())
+
+        key = (int(ts[0]), int(ts[-1]), len(ts))
+        hit = self._block_cache.get(key)
+        if hit is not None and np.array_equal(hit[0], ts):
+            self._block_cache.move_to_end(key)
+            return hit[1]
+
+        block = None
+        if self._block_cache:
+            cached_ts, cached_block = next(reversed(self._block_cache.values()))
+            start = int(np.searchsorted(cached_ts, ts[0]))
+            overlap = len(cached_ts) - start
+            if 0 < overlap <= len(ts) and np.array_equal(
+                cached_ts[start:], ts[:overlap]
+            ):
+                block = np.concatenate(
+                    [
+                        cached_block[start:],
+                        time_features(ts[overlap:], *self.kernel_tables()),
+                    ]
+                )
+
+        if block is None:
+            block = time_features(ts, *self.kernel_tables())
+
+        nbytes = ts.nbytes + block.nbytes
+        if nbytes > self.cache_max_bytes:
+            return block
+
+        if key in self._block_cache:
+            self._drop_cached_block(key)
+        self._block_cache[key] = (ts.copy(), block)
+        self._cache_bytes += nbytes
+        while (
+            len(self._block_cache) > self.cache_size
+            or self._cache_bytes > self.cache_max_bytes
+        ):
+            self._drop_cached_block(next(iter(self._block_cache)))
+        return block
+
+    def _drop_cached_block(self, key: Tuple[int, int, int]):
+        """Remove one entry from the block cache"""
+        cached_ts, cached_block = self._block_cache.pop(key)
+        self._cache_bytes -= cached_ts.nbytes + cached_block.nbytes
+
+    def clear_cache(self):
+        """Release every cached feature block"""
+        self._block_cache.clear()
+        self._cache_bytes = 0
 
     # ========================================================================
     # MAIN FUNCTION
     # ========================================================================
 
-    def add_all_time_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def add_all_time_features(
+        self, df: pd.DataFrame, verbose: bool = False
+    ) -> pd.DataFrame:
         """
         Add all time-based features to DataFrame
 
         Args:
             df: Input DataFrame with timestamp column
+            verbose: Print progress banners (otherwise they only go to
+                     logger.debug, so repeated calls stay quiet)
 
         Returns:
             DataFrame with added time features
         """
-        print("\n⏰ Adding Time-Based Features...")
-        print("=" * 70)
-
         # Validate data
         if not self.validate_data(df):
             return df
 
-        # Make a copy
-        df = df.copy()
+        previous_verbose, self.verbose = self.verbose, verbose
+        self._status("\n⏰ Adding Time-Based Features...")
+        self._status("=" * 70)
+
+        # Shallow copy only: features are appended with concat and the
+        # timestamp column is replaced (never written into), so the caller's
+        # data is left untouched without duplicating it
+        df = df.copy(deep=False)
+        self._added_features = []
 
         # Add all feature groups
         try:
-            df = self.add_basic_time_features(df)
-            df = self.add_trading_sessions(df)
-            df = self.add_market_hours(df)
-            df = self.add_cyclical_features(df)
-            df = self.add_time_since_events(df)
-            df = self.add_special_periods(df)
-
-            print("  └─ ✅ All time features added!")
-
-            # Count features
-            time_feature_cols = [
-                col
-                for col in df.columns
-                if col
-                not in [
-                    "timestamp",
-                    "symbol",
-                    "timeframe",
-                    "open",
-                    "high",
-                    "low",
-                    "close",
-                    "tick_volume",
-                    "real_volume",
-                    "spread",
-                ]
-            ]
-
-            # Count only time features (those we just added)
-            original_cols = [
-                "timestamp",
-                "symbol",
-                "timeframe",
-                "open",
-                "high",
-                "low",
-                "close",
-                "tick_volume",
-                "real_volume",
-                "spread",
-            ]
-            new_time_features = [col for col in df.columns if col not in original_cols]
-
-            print(f"\n⏰ Total time features created: {len(new_time_features)}")
+            # Parse timestamps once; every group reads components from dti
+            df = self.ensure_datetime(df)
+            dti = self.get_datetime_index(df)
+
+            if NUMBA_AVAILABLE:
+                df = self.add_fused_time_features(df, dti)
+            else:
+                ctx = self.time_components(dti)
+                df = self.add_basic_time_features(df, dti, ctx)
+                df = self.add_trading_sessions(df, dti, ctx)
+                df = self.add_market_hours(df, dti, ctx)
+                df = self.add_cyclical_features(df, dti, ctx)
+                df = self.add_time_since_events(df, dti, ctx)
+                df = self.add_special_periods(df, dti, ctx)
+
+            self._status("  └─ ✅ All time features added!")
+            self._status(
+                f"\n⏰ Total time features created: {len(self._added_features)}"
+            )
 
         except Exception as e:
-            print(f"\n❌ Error adding time features: {e}")
-            import traceback
+            logger.exception("Error adding time features: %s", e)
 
-            traceback.print_exc()
+        finally:
+            self.verbose = previous_verbose
 
         return df
 
+    def add_all_time_features_batch(self, timestamps: np.ndarray) -> np.ndarray:
+        """
+        Compute all time features for many series at once
+
+        Each column of `timestamps` is one symbol/timeframe; all columns are
+        processed by one compiled kernel (in parallel across columns).
+
+        Args:
+            timestamps: (T, K) datetime64 or int64 ns-since-epoch array
+                        (naive / UTC wall-clock time)
+
+        Returns:
+            np.ndarray: float32 array (T, K, F); feature f is
+                        TIME_FEATURE_COLUMNS[f], NaT rows are NaN
+        """
+        timestamps = np.asarray(timestamps)
+        if timestamps.ndim != 2:
+            raise ValueError(f"timestamps must be 2-D (T, K), got {timestamps.shape}")
+        if np.issubdtype(timestamps.dtype, np.datetime64):
+            timestamps = timestamps.astype("datetime64[ns]").view(np.int64)
+
+        return time_features_batch(timestamps, *self.kernel_tables())
+
+    def hour_flag_table(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Hour flags as a dense table for the compiled kernels
+
+        Returns:
+            tuple: ((24, J) int8 table, int64 output column index per flag)
+        """
+        names = list(self.hour_flags)
+        hours = np.arange(24)
+        table = np.column_stack(
+            [self.hour_flag_columns(hours, [name])[name] for name in names]
+        )
+        cols = np.array([TIME_FEATURE_COLUMNS.index(name) for name in names])
+        return np.ascontiguousarray(table, dtype=np.int8), cols.astype(np.int64)
+
+    def cyclical_table(self) -> np.ndarray:
+        """
+        cyclical_luts stacked for the compiled kernels
+
+        Returns:
+            np.ndarray: (8, 32) float32, rows hour_sin, hour_cos, day_sin,
+                        ..., month_cos (TIME_FEATURE_COLUMNS order)
+        """
+        size = max(len(sin_lut) for sin_lut, _ in self.cyclical_luts.values())
+        table = np.zeros((2 * len(self.cyclical_luts), size), dtype=np.float32)
+        for i, (sin_lut, cos_lut) in enumerate(self.cyclical_luts.values()):
+            table[2 * i, : len(sin_lut)] = sin_lut
+            table[2 * i + 1, : len(cos_lut)] = cos_lut
+        return table
+
+    def kernel_tables(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Lookup tables passed to time_features / time_features_batch"""
+        return (*self.hour_flag_table(), self.cyclical_table())
+
     def get_feature_list(self, df: pd.DataFrame) -> list:
         """
         Get list of time feature names
 
+        Uses the columns recorded while adding features; falls back to a
+        keyword scan of df.columns when nothing has been added by this
+        instance (e.g. a DataFrame loaded from disk).
+
         Returns:
             list: Time feature column names
         """
+        if self._added_features:
+            columns = set(df.columns)
+            return [col for col in self._added_features if col in columns]
+
+        # Fallback (deprecated): keyword substring scan
         time_keywords = [
             "hour",
             "day",
@@ -466,7 +973,7 @@ def main():
 
     # Add time features
     tf = TimeFeatures()
-    df_with_time = tf.add_all_time_features(df)
+    df_with_time = tf.add_all_time_features(df, verbose=True)
 
     # Show results
     print("\n" + "=" * 70)
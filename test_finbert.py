@@ -20,9 +20,11 @@ test_sentences = [
 
 print("\n📊 Testing FinBERT on sample sentences:\n")
 
-for sentence in test_sentences:
+# Analyze all sentences in one batched call
+results = collector.analyze_sentiment_batch(test_sentences, method="auto")
+
+for sentence, result in zip(test_sentences, results):
     print(f"Text: {sentence}")
-    result = collector.analyze_sentiment(sentence, method="auto")
     print(f"  Sentiment: {result['sentiment']}")
     print(f"  Polarity: {result['polarity']:.4f}")
     print(f"  Method: {result['method']}")
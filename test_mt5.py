@@ -9,6 +9,7 @@ import sys
 from datetime import datetime
 
 import MetaTrader5 as mt5
+import pandas as pd
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -209,7 +210,7 @@ else:
             print(f"    Bid:         {tick.bid:.2f}")
             print(f"    Ask:         {tick.ask:.2f}")
             print(f"    Spread:      {(tick.ask - tick.bid) * 100:.1f} points")
-            print(f"    Time:        {datetime.fromtimestamp(tick.time)}")
+            print(f"    Time:        {pd.to_datetime(tick.time, unit='s')}")
 
 # Get recent bars
 print()
@@ -226,8 +227,9 @@ if found_symbol:
         print(f"✅ Successfully retrieved {len(rates)} bars")
         print()
         print("  Last 3 bars (M5):")
-        for i, rate in enumerate(rates[-3:]):
-            time_str = datetime.fromtimestamp(rate["time"]).strftime("%Y-%m-%d %H:%M")
+        # Format all bar times in one vectorized call (same as the collectors)
+        times = pd.to_datetime(rates["time"][-3:], unit="s").strftime("%Y-%m-%d %H:%M")
+        for time_str, rate in zip(times, rates[-3:]):
             print(
                 f"    {time_str} | O:{rate['open']:.2f} H:{rate['high']:.2f} L:{rate['low']:.2f} C:{rate['close']:.2f}"
             )
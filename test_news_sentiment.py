@@ -17,13 +17,98 @@ Test News Sentiment System
 """
 
 import argparse
+import hashlib
+import os
+import time
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING, Optional
 
-import pandas as pd
+# pandas / src.* ถูก import ภายในฟังก์ชันที่ใช้ เพื่อให้ --help และ path ที่
+# จบเร็ว (เช่นไม่มีข้อมูลราคา) ไม่ต้องรอโหลด module หนักๆ
+# ส่วนด้านล่างนี้ import เฉพาะตอน type check (สำหรับ annotation ที่เป็น string)
+if TYPE_CHECKING:
+    import pandas as pd
 
-from src.data_collection.news_collector import NewsCollector
-from src.features.news_features import NewsSentimentFeatures, create_sample_news_data
+    from src.data_collection.news_collector import NewsCollector
+
+# cache ผลลัพธ์จาก NewsAPI ไว้บนดิสก์ เพื่อไม่ต้องยิง API ซ้ำทุกครั้งที่รันเทส
+NEWS_CACHE_DIR = Path(".cache")
+NEWS_CACHE_TTL = 3600  # วินาที
+
+
+def news_api_key_available() -> bool:
+    """ตรวจว่ามี NEWS_API_KEY (จาก environment หรือ .env) ก่อนสร้าง NewsCollector"""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return bool(os.environ.get("NEWS_API_KEY"))
+
+
+def get_gold_news_cached(
+    collector: "NewsCollector", days: int = 7, ttl: int = NEWS_CACHE_TTL
+) -> "pd.DataFrame":
+    """
+    ดึงข่าวทองคำผ่าน cache (parquet) ที่มีอายุ ttl วินาที
+
+    key ของ cache คือ (days, วันที่, ชั่วโมง) ถ้าไม่มี pyarrow จะดึงข่าวตรงๆ
+    โดยไม่ใช้ cache
+
+    Args:
+        collector: NewsCollector ที่ใช้ดึงข่าวเมื่อ cache ไม่มีหรือหมดอายุ
+        days: จำนวนวันย้อนหลัง
+        ttl: อายุของ cache (วินาที)
+
+    Returns:
+        DataFrame with news and sentiment
+    """
+    import pandas as pd
+
+    now = datetime.now()
+    key = hashlib.sha1(
+        f"get_gold_news|{days}|{now:%Y-%m-%d}|{now.hour}".encode()
+    ).hexdigest()
+    cache_path = NEWS_CACHE_DIR / f"news_{key}.parquet"
+
+    if cache_path.exists() and time.time() - cache_path.stat().st_mtime < ttl:
+        try:
+            df_news = pd.read_parquet(cache_path)
+            print(f"📦 Using cached news: {cache_path} ({len(df_news)} articles)")
+            return df_news
+        except ImportError:
+            pass
+
+    df_news = collector.get_gold_news(days=days)
+
+    if not df_news.empty:
+        try:
+            NEWS_CACHE_DIR.mkdir(exist_ok=True)
+            df_news.to_parquet(cache_path, index=False)
+        except ImportError:
+            pass
+
+    return df_news
+
+
+def read_price_csv(path: Path) -> "pd.DataFrame":
+    """
+    โหลดไฟล์ราคา CSV ด้วย pyarrow parser (multithreaded) ถ้ามี
+
+    อ่านทุก column เพราะ feature ราคาทั้งหมดต้องไปอยู่ในไฟล์ที่รวมกับ
+    sentiment แล้วด้วย
+
+    Args:
+        path: path ของไฟล์ CSV
+
+    Returns:
+        DataFrame ของราคา
+    """
+    import pandas as pd
+
+    try:
+        return pd.read_csv(path, engine="pyarrow")
+    except ImportError:
+        return pd.read_csv(path)
 
 
 def test_news_collection():
@@ -32,10 +117,17 @@ def test_news_collection():
     print("TEST 1: NEWS COLLECTION")
     print("=" * 70)
 
+    # ไม่มี key ก็ไม่ต้อง import NewsCollector หรือยิง request ที่ไม่มีทางสำเร็จ
+    if not news_api_key_available():
+        print("⚠️ No NEWS_API_KEY set")
+        return None
+
+    from src.data_collection.news_collector import NewsCollector
+
     collector = NewsCollector()
 
-    # ดึงข่าว 7 วันย้อนหลัง
-    df_news = collector.get_gold_news(days=7)
+    # ดึงข่าว 7 วันย้อนหลัง (ใช้ cache ถ้าเพิ่งดึงไปไม่เกิน 1 ชั่วโมง)
+    df_news = get_gold_news_cached(collector, days=7)
 
     if df_news.empty:
         print("⚠️ No news collected. Using sample data instead.")
@@ -47,35 +139,53 @@ def test_news_collection():
     return news_path
 
 
-def test_sentiment_features(news_path: str):
-    """ทดสอบการสร้าง sentiment features"""
+def test_sentiment_features(news_path: str, today_str: Optional[str] = None):
+    """
+    ทดสอบการสร้าง sentiment features
+
+    Args:
+        news_path: path ไปยังไฟล์ข่าว
+        today_str: วันที่ (YYYYMMDD) สำหรับชื่อไฟล์ผลลัพธ์ (default: วันนี้)
+    """
+    today_str = today_str or datetime.now().strftime("%Y%m%d")
     print("\n" + "=" * 70)
     print("TEST 2: SENTIMENT FEATURES")
     print("=" * 70)
 
-    # โหลดข้อมูลราคา
-    price_files = list(Path("data").glob("processed_data_*.csv"))
+    # โหลดข้อมูลราคา (ไฟล์ที่แก้ไขล่าสุด)
+    price_files = Path("data").glob("processed_data_*.csv")
+    latest_price_file = max(
+        price_files, key=lambda path: path.stat().st_mtime, default=None
+    )
 
-    if not price_files:
+    if latest_price_file is None:
         print("❌ No price data found!")
         print("💡 Run 'python daily_update.py' first to collect price data.")
         return None
 
-    latest_price_file = sorted(price_files)[-1]
+    # compile kernel ของ sentiment window ก่อนโหลดข้อมูลจริง (หลังเจอไฟล์ราคา
+    # แล้ว เพื่อให้ path ที่ไม่มีข้อมูลราคาจบเร็วโดยไม่ต้อง import numba)
+    from src.features.news_features import NewsSentimentFeatures
+
+    NewsSentimentFeatures.warmup()
+
     print(f"\n📊 Loading price data: {latest_price_file.name}")
 
-    df_price = pd.read_csv(latest_price_file)
+    df_price = read_price_csv(latest_price_file)
     print(f"   Total rows: {len(df_price)}")
     print(f"   Features: {len(df_price.columns)}")
 
-    # รวม sentiment features
+    # โหลดข่าวครั้งเดียว แล้วรวม sentiment features
     sentiment_features = NewsSentimentFeatures()
-    df_combined = sentiment_features.merge_price_and_news(
-        df_price, str(news_path), windows=[1, 4, 12, 24]
+    df_news = sentiment_features.load_news(str(news_path))
+    df_combined = sentiment_features.merge_price_and_news_df(
+        df_price, df_news, windows=[1, 4, 12, 24]
     )
 
     # แสดงผล
-    sentiment_cols = [col for col in df_combined.columns if "news_" in col]
+    sentiment_cols = df_combined.columns[
+        df_combined.columns.str.startswith("news_")
+    ].tolist()
 
     print("\n" + "=" * 70)
     print("📊 RESULTS")
@@ -95,43 +205,62 @@ def test_sentiment_features(news_path: str):
     print("\n📈 Sample Data (first 5 rows):")
     print("-" * 70)
     display_cols = ["timestamp", "close"] + sentiment_cols[:3]
-    print(df_combined[display_cols].head())
+    print(
+        df_combined[display_cols]
+        .head()
+        .to_string(index=False, max_cols=10, float_format=lambda x: f"{x:.4f}")
+    )
 
     # Statistics
     print("\n📊 Sentiment Statistics:")
     print("-" * 70)
-    for col in [
-        "news_24h_sentiment_avg",
-        "news_24h_positive_ratio",
-        "news_24h_negative_ratio",
-    ]:
-        if col in df_combined.columns:
+    stats_cols = [
+        col
+        for col in (
+            "news_24h_sentiment_avg",
+            "news_24h_positive_ratio",
+            "news_24h_negative_ratio",
+        )
+        if col in df_combined.columns
+    ]
+    if stats_cols:
+        stats = df_combined[stats_cols].agg(["mean", "min", "max"]).T
+        for col, row in stats.iterrows():
             print(f"  {col}:")
-            print(f"    Mean: {df_combined[col].mean():.4f}")
-            print(f"    Min:  {df_combined[col].min():.4f}")
-            print(f"    Max:  {df_combined[col].max():.4f}")
-
-    # บันทึก
-    output_path = (
-        Path("data") / f"price_with_sentiment_{datetime.now().strftime('%Y%m%d')}.csv"
-    )
-    df_combined.to_csv(output_path, index=False)
+            print(f"    Mean: {row['mean']:.4f}")
+            print(f"    Min:  {row['min']:.4f}")
+            print(f"    Max:  {row['max']:.4f}")
+
+    # บันทึก: parquet (zstd) เป็นค่าเริ่มต้น ตั้ง SENTIMENT_OUTPUT_CSV=1 ถ้าต้องการ CSV
+    output_path = Path("data") / f"price_with_sentiment_{today_str}.parquet"
+    saved = False
+    if os.getenv("SENTIMENT_OUTPUT_CSV", "") != "1":
+        try:
+            df_combined.to_parquet(output_path, compression="zstd", index=False)
+            saved = True
+        except ImportError:
+            print("📌 pyarrow not installed - saving as CSV")
+    if not saved:
+        output_path = output_path.with_suffix(".csv")
+        df_combined.to_csv(output_path, index=False, lineterminator="\n")
     print(f"\n💾 Saved combined data: {output_path}")
 
     return output_path
 
 
-def test_with_sample_data():
+def test_with_sample_data(today_str: Optional[str] = None):
     """ทดสอบด้วยข้อมูลตัวอย่าง (ไม่ต้องมี API key)"""
     print("\n" + "=" * 70)
     print("🧪 TESTING WITH SAMPLE DATA")
     print("=" * 70)
 
+    from src.features.news_features import create_sample_news_data
+
     # สร้างข้อมูลข่าวตัวอย่าง
     news_path = create_sample_news_data()
 
     # ทดสอบ sentiment features
-    result = test_sentiment_features(str(news_path))
+    result = test_sentiment_features(str(news_path), today_str)
 
     return result
 
@@ -147,6 +276,14 @@ def main():
 
     args = parser.parse_args()
 
+    # วันที่ของการรันนี้ (ไฟล์ผลลัพธ์ใช้ชื่อเดียวกันแม้รันข้ามเที่ยงคืน)
+    today_str = datetime.now().strftime("%Y%m%d")
+
+    # ไม่มี API key -> ใช้ข้อมูลตัวอย่างอัตโนมัติ
+    if not args.sample and not news_api_key_available():
+        print("⚠️ No NEWS_API_KEY set - switching to sample data")
+        args.sample = True
+
     print("=" * 70)
     print("NEWS SENTIMENT SYSTEM - TEST SUITE")
     print("=" * 70)
@@ -154,16 +291,16 @@ def main():
 
     if args.sample:
         # ใช้ข้อมูลตัวอย่าง
-        result = test_with_sample_data()
+        result = test_with_sample_data(today_str)
     else:
         # ดึงข่าวจริง
         news_path = test_news_collection()
 
         if news_path:
-            result = test_sentiment_features(str(news_path))
+            result = test_sentiment_features(str(news_path), today_str)
         else:
             print("\n⚠️ News collection failed. Trying sample data...")
-            result = test_with_sample_data()
+            result = test_with_sample_data(today_str)
 
     # สรุปผล
     print("\n" + "=" * 70)
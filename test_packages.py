@@ -4,153 +4,238 @@ Test Package Installation
 ทดสอบว่าติดตั้ง packages ที่จำเป็นครบแล้วหรือไม่
 """
 
+import contextlib
+import importlib
+import io
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType
+from typing import List, Tuple
 
 print("=" * 70)
 print("TESTING PACKAGE INSTALLATION")
 print("=" * 70)
 print(f"Python Version: {sys.version}")
 print("=" * 70)
-print()
+print(flush=True)  # show the header while the imports run
 
 # Track results
 success_count = 0
 fail_count = 0
 warning_count = 0
 
+# (package name, exception) of every failed import, formatted in the summary
+failures: List[Tuple[str, Exception]] = []
+
+
+# (section, [(module name, package name shown if different)])
+PACKAGE_GROUPS = [
+    (
+        "CORE PACKAGES",
+        [
+            ("MetaTrader5", None),
+            ("pandas", None),
+            ("numpy", None),
+            ("sklearn", "scikit-learn"),
+            ("xgboost", None),
+            ("tensorflow", None),
+            ("torch", None),
+            ("transformers", None),
+        ],
+    ),
+    ("TECHNICAL ANALYSIS", [("talib", "TA-Lib"), ("pandas_ta", None)]),
+    (
+        "DATA COLLECTION",
+        [
+            ("requests", None),
+            ("bs4", "BeautifulSoup4"),
+            ("yfinance", None),
+            ("newsapi", "newsapi-python"),
+        ],
+    ),
+    (
+        "VISUALIZATION",
+        [
+            ("matplotlib", None),
+            ("seaborn", None),
+            ("plotly", None),
+            ("mplfinance", None),
+        ],
+    ),
+    ("MACHINE LEARNING", [("lightgbm", None), ("statsmodels", None), ("scipy", None)]),
+    ("NLP & SENTIMENT", [("nltk", None), ("textblob", None)]),
+    (
+        "UTILITIES",
+        [
+            ("dotenv", "python-dotenv"),
+            ("telegram", "python-telegram-bot"),
+            ("schedule", None),
+            ("sqlalchemy", None),
+            ("tqdm", None),
+            ("loguru", None),
+            ("joblib", None),
+        ],
+    ),
+    ("OTHER DEPENDENCIES", [("pytz", None), ("numba", None), ("PIL", "Pillow")]),
+]
+
+# Packages that only install on some platforms: module -> sys.platform values
+PLATFORM_ONLY = {"MetaTrader5": ("win32",)}
+
+# Give up on connecting to the MT5 terminal after this long
+MT5_INIT_TIMEOUT_MS = 5000
+
+# Packages imported on the main thread before the pool starts
+# (MetaTrader5 talks to the terminal through thread-affine Windows handles)
+MAIN_THREAD_IMPORTS = ["MetaTrader5"]
+
+# Heavy packages that import one another (transformers loads torch and
+# tensorflow, xgboost loads sklearn); imported one after another in a single
+# worker so two threads never race on a half-initialized module
+SEQUENTIAL_IMPORTS = ["sklearn", "xgboost", "torch", "tensorflow", "transformers"]
+
+
+def supported_here(module_name):
+    """Whether the module can be installed on this platform at all"""
+    return sys.platform in PLATFORM_ONLY.get(module_name, (sys.platform,))
+
+
+def probe_import(module_name):
+    """Import a module, returning the module or the exception raised"""
+    try:
+        return importlib.import_module(module_name)
+    except Exception as e:
+        return e
+
+
+def probe_imports(module_names):
+    """probe_import each module in turn, returning the results in order"""
+    return [probe_import(module_name) for module_name in module_names]
 
-def test_import(module_name, alias=None, package_name=None):
-    """Test importing a module"""
+
+def report_import(module_name, result, package_name=None):
+    """Print the outcome of probe_import and update the counters"""
     global success_count, fail_count, warning_count
 
     display_name = package_name or module_name
-    try:
-        if alias:
-            exec(f"import {module_name} as {alias}")
-            # Try to get version
-            try:
-                version = eval(f"{alias}.__version__")
-                print(f"✅ {display_name:<20} {version}")
-            except:
-                print(f"✅ {display_name:<20} (no version info)")
-        else:
-            exec(f"import {module_name}")
-            # Try to get version
-            try:
-                version = eval(f"{module_name}.__version__")
-                print(f"✅ {display_name:<20} {version}")
-            except:
-                print(f"✅ {display_name:<20} (no version info)")
-        success_count += 1
-        return True
-    except ImportError as e:
-        if "optional" in str(e).lower():
+    if isinstance(result, ImportError):
+        if "optional" in str(result).lower():
             print(f"⚠️  {display_name:<20} (optional - not installed)")
             warning_count += 1
         else:
-            print(f"❌ {display_name:<20} FAILED - {str(e)[:50]}")
+            print(f"❌ {display_name:<20} FAILED")
+            failures.append((display_name, result))
             fail_count += 1
         return False
-    except Exception as e:
-        print(f"❌ {display_name:<20} ERROR - {str(e)[:50]}")
+    if isinstance(result, Exception):
+        print(f"❌ {display_name:<20} ERROR")
+        failures.append((display_name, result))
         fail_count += 1
         return False
 
+    version = getattr(result, "__version__", None)
+    if version is not None:
+        print(f"✅ {display_name:<20} {version}")
+    else:
+        print(f"✅ {display_name:<20} (no version info)")
+    success_count += 1
+    return True
 
-print("CORE PACKAGES:")
-print("-" * 50)
-test_import("MetaTrader5", "mt5")
-test_import("pandas", "pd")
-test_import("numpy", "np")
-test_import("sklearn", package_name="scikit-learn")
-test_import("xgboost", "xgb")
-test_import("tensorflow", "tf")
-test_import("torch")
-test_import("transformers")
-
-print("\nTECHNICAL ANALYSIS:")
-print("-" * 50)
-test_import("talib", package_name="TA-Lib")
-test_import("pandas_ta")
-
-print("\nDATA COLLECTION:")
-print("-" * 50)
-test_import("requests")
-test_import("beautifulsoup4", "bs4", "BeautifulSoup4")
-test_import("yfinance", "yf")
-test_import("newsapi", package_name="newsapi-python")
-
-print("\nVISUALIZATION:")
-print("-" * 50)
-test_import("matplotlib", "plt")
-test_import("seaborn", "sns")
-test_import("plotly")
-test_import("mplfinance")
-
-print("\nMACHINE LEARNING:")
-print("-" * 50)
-test_import("lightgbm", "lgb")
-test_import("statsmodels")
-test_import("scipy")
-
-print("\nNLP & SENTIMENT:")
-print("-" * 50)
-test_import("nltk")
-test_import("textblob")
-
-print("\nUTILITIES:")
-print("-" * 50)
-test_import("dotenv", package_name="python-dotenv")
-test_import("telegram", package_name="python-telegram-bot")
-test_import("schedule")
-test_import("sqlalchemy")
-test_import("tqdm")
-test_import("loguru")
-test_import("joblib")
-
-print("\nOTHER DEPENDENCIES:")
-print("-" * 50)
-test_import("pytz")
-test_import("numba")
-test_import("PIL", package_name="Pillow")
 
-print("\n" + "=" * 70)
-print("SUMMARY:")
-print("-" * 50)
-print(f"✅ Success: {success_count} packages")
-print(f"❌ Failed:  {fail_count} packages")
-print(f"⚠️  Warning: {warning_count} packages (optional)")
-print("=" * 70)
+def report_skipped(module_name, package_name=None):
+    """Report a package that does not exist on this platform"""
+    global warning_count
 
-if fail_count == 0:
-    print("\n🎉 ALL REQUIRED PACKAGES INSTALLED SUCCESSFULLY!")
-    print("\nYou can now run:")
-    print("  python daily_update.py    - To update data")
-    print("  python paper_trading.py   - To start paper trading")
-else:
-    print(f"\n⚠️  {fail_count} packages need to be installed.")
-    print("\nTo install missing packages, run:")
-    print("  python -m pip install [package_name]")
+    display_name = package_name or module_name
+    print(f"⚠️  {display_name:<20} (not available on {sys.platform} - skipped)")
+    warning_count += 1
+
+
+# Import everything up front - the heavy group runs in one worker while the
+# lightweight packages overlap in the rest of the pool, since loading
+# extension modules releases the GIL - then report in the original order
+results = {
+    name: probe_import(name) for name in MAIN_THREAD_IMPORTS if supported_here(name)
+}
+sequential = [name for name in SEQUENTIAL_IMPORTS if supported_here(name)]
+pending = [
+    module_name
+    for _, packages in PACKAGE_GROUPS
+    for module_name, _ in packages
+    if module_name not in results
+    and module_name not in sequential
+    and supported_here(module_name)
+]
+with ThreadPoolExecutor(max_workers=8) as executor:
+    heavy = executor.submit(probe_imports, sequential)
+    results.update(zip(pending, executor.map(probe_import, pending)))
+    results.update(zip(sequential, heavy.result()))
+
+# Collect the report and summary in memory and write them in one call
+# instead of one console write per line
+report = io.StringIO()
+with contextlib.redirect_stdout(report):
+    for i, (section, packages) in enumerate(PACKAGE_GROUPS):
+        print(f"\n{section}:" if i else f"{section}:")
+        print("-" * 50)
+        for module_name, package_name in packages:
+            if module_name in results:
+                report_import(module_name, results[module_name], package_name)
+            else:
+                report_skipped(module_name, package_name)
+
+    print("\n" + "=" * 70)
+    print("SUMMARY:")
+    print("-" * 50)
+    print(f"✅ Success: {success_count} packages")
+    print(f"❌ Failed:  {fail_count} packages")
+    print(f"⚠️  Warning: {warning_count} packages (optional)")
+    print("=" * 70)
+
+    if failures:
+        print("\nFAILURES:")
+        print("-" * 50)
+        for display_name, error in failures:
+            message = str(error).strip().splitlines()
+            detail = message[0] if message else ""
+            print(f"❌ {display_name:<20} {type(error).__name__}: {detail}")
+
+    if fail_count == 0:
+        print("\n🎉 ALL REQUIRED PACKAGES INSTALLED SUCCESSFULLY!")
+        print("\nYou can now run:")
+        print("  python daily_update.py    - To update data")
+        print("  python paper_trading.py   - To start paper trading")
+    else:
+        print(f"\n⚠️  {fail_count} packages need to be installed.")
+        print("\nTo install missing packages, run:")
+        print("  python -m pip install [package_name]")
 
-print("\n" + "=" * 70)
+    print("\n" + "=" * 70)
+sys.stdout.write(report.getvalue())
+sys.stdout.flush()
 
 # Test MT5 connection
 print("\nTESTING MT5 CONNECTION:")
 print("-" * 50)
-try:
-    import MetaTrader5 as mt5
-
-    if mt5.initialize():
-        info = mt5.terminal_info()
-        if info:
-            print(f"✅ MT5 Terminal Connected")
-            print(f"   Version: {info.version}")
-            print(f"   Path: {info.path}")
-        mt5.shutdown()
-    else:
-        print("⚠️  MT5 Terminal not running or not configured")
-        print("   Make sure MetaTrader 5 is installed and running")
-except Exception as e:
-    print(f"⚠️  Could not test MT5: {e}")
+if sys.platform != "win32":
+    print("⚠️  MT5 only supported on Windows, skipping")
+else:
+    # Reuse the module imported above rather than importing it a second time
+    mt5 = results.get("MetaTrader5")
+    try:
+        if not isinstance(mt5, ModuleType):
+            print("⚠️  MetaTrader5 package not available - skipping connection test")
+        elif mt5.initialize(timeout=MT5_INIT_TIMEOUT_MS):
+            info = mt5.terminal_info()
+            if info:
+                print(f"✅ MT5 Terminal Connected")
+                print(f"   Version: {info.version}")
+                print(f"   Path: {info.path}")
+            mt5.shutdown()
+        else:
+            print("⚠️  MT5 Terminal not running or not configured")
+            print("   Make sure MetaTrader 5 is installed and running")
+    except Exception as e:
+        print(f"⚠️  Could not test MT5: {e}")
 
 print("=" * 70)
@@ -0,0 +1,78 @@
+"""
+Tests for the moving average kernels against TA-Lib and pandas
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import talib
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from src.features import _ma_njit  # noqa: E402
+from src.features._ma_njit import MA_EMA, MA_SMA, MA_WMA, moving_averages  # noqa: E402
+
+
+def price_series(n: int = 500) -> np.ndarray:
+    """Trending, noisy close prices"""
+    rng = np.random.default_rng(0)
+    return np.linspace(1900.0, 2100.0, n) + rng.normal(0.0, 5.0, n)
+
+
+def rolling_wma(x: np.ndarray, period: int) -> np.ndarray:
+    """Reference WMA: NaN for any window containing a NaN"""
+    weights = np.arange(1, period + 1, dtype=np.float64)
+    return (
+        pd.Series(x)
+        .rolling(period)
+        .apply(lambda w: np.dot(w, weights) / weights.sum(), raw=True)
+        .to_numpy()
+    )
+
+
+def test_matches_talib_without_nan():
+    x = price_series()
+    x[:5] = np.nan
+    funcs = {MA_SMA: talib.SMA, MA_EMA: talib.EMA, MA_WMA: talib.WMA}
+    for kind, func in funcs.items():
+        for period in [5, 20, 50]:
+            (got,) = moving_averages(x, [kind], [period])
+            np.testing.assert_allclose(
+                got, func(x, timeperiod=period), rtol=1e-10, equal_nan=True
+            )
+
+
+def test_wma_recovers_after_nan():
+    x = price_series()
+    x[[100, 300, 304]] = np.nan
+    for period in [1, 10, 20, 50]:
+        (got,) = moving_averages(x, [MA_WMA], [period])
+        expected = rolling_wma(x, period)
+        np.testing.assert_allclose(got, expected, rtol=1e-10, equal_nan=True)
+        assert np.isfinite(got[-1])
+
+
+def test_sma_ema_stay_nan_after_nan_like_talib():
+    x = price_series()
+    x[100] = np.nan
+    for kind, func in {MA_SMA: talib.SMA, MA_EMA: talib.EMA}.items():
+        (got,) = moving_averages(x, [kind], [20])
+        np.testing.assert_array_equal(np.isnan(got), np.isnan(func(x, timeperiod=20)))
+        assert np.isnan(got[100:]).all()
+
+
+def test_fallback_matches_kernel(monkeypatch):
+    x = price_series()
+    x[:5] = np.nan
+    x[[100, 300, 304]] = np.nan
+    kinds = [MA_SMA, MA_EMA, MA_WMA, MA_WMA]
+    periods = [20, 20, 10, 50]
+    expected = moving_averages(x, kinds, periods)
+
+    monkeypatch.setattr(_ma_njit, "NUMBA_AVAILABLE", False)
+    got = moving_averages(x, kinds, periods)
+    for g, e in zip(got, expected):
+        np.testing.assert_allclose(g, e, rtol=1e-10, equal_nan=True)
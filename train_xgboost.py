@@ -65,7 +65,10 @@ class XGBoostTrainer:
     def load_and_prepare_data(self):
         """Load and prepare data"""
         print("Loading data...")
-        df = pd.read_csv(self.data_path)
+        if str(self.data_path).endswith(".parquet"):
+            df = pd.read_parquet(self.data_path)
+        else:
+            df = pd.read_csv(self.data_path)
         print(f"  Loaded {len(df):,} rows, {len(df.columns)} columns")
 
         # Get numeric columns only (exclude target)
@@ -441,7 +444,10 @@ def main():
 
     parser = argparse.ArgumentParser(description="Train XGBoost model for trading")
     parser.add_argument(
-        "--data-path", "-d", required=True, help="Path to CSV with features and target"
+        "--data-path",
+        "-d",
+        required=True,
+        help="Path to CSV/parquet with features and target",
     )
     parser.add_argument(
         "--test-size",